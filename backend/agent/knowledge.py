@@ -0,0 +1,200 @@
+import re
+import threading
+from pathlib import Path
+from typing import NamedTuple
+from models import WeatherConditions
+
+KNOWLEDGE_DIR = Path(__file__).resolve().parents[2] / "knowledge"
+
+RACES = ("5K", "10K", "half_marathon", "marathon")
+RACE_ALIASES = {"5k": "5K", "10k": "10K", "half": "half_marathon", "half_marathon": "half_marathon", "marathon": "marathon"}
+
+# Guides written for specific distances, every other guide applies to all races
+FILE_RACES = {
+    "5K_STRATEGY.md": ("5K",),
+    "10K_STRATEGY.md": ("10K",),
+    "HALF_MARATHON_STRATEGY.md": ("half_marathon",),
+    "MARATHON_STRATEGY.md": ("marathon",),
+    "5K_10K_PREP.md": ("5K", "10K"),
+    "MARATHON_HALF_MARATHON_PREP.md": ("half_marathon", "marathon"),
+    "NUTRITION_GUIDE.md": ("half_marathon", "marathon"),
+}
+
+# Headings that name a distance narrow the section to it ("Carb Loading — Marathon")
+RACE_HEADING_PATTERNS = {
+    "5K": re.compile(r"\b5K\b", re.IGNORECASE),
+    "10K": re.compile(r"\b10K\b", re.IGNORECASE),
+    "half_marathon": re.compile(r"\bhalf marathon\b", re.IGNORECASE),
+    "marathon": re.compile(r"(?<!half )\bmarathon\b", re.IGNORECASE),
+}
+
+# Conditions sections are tagged by heading, untagged ones (summary, universal principles) always apply
+CONDITION_PATTERNS = {
+    "cold": re.compile(r"\bcold\b", re.IGNORECASE),
+    "heat": re.compile(r"\b(hot|heat)\b", re.IGNORECASE),
+    "rain": re.compile(r"\brain\b", re.IGNORECASE),
+    "hills": re.compile(r"\bhills?\b", re.IGNORECASE),
+    "wind": re.compile(r"\bwind\b", re.IGNORECASE),
+    "crowds": re.compile(r"\bcrowded\b", re.IGNORECASE),
+}
+
+# CONDITIONS_GUIDE.md chunk 16 thresholds
+COLD_F = 40
+HOT_F = 60
+WINDY_MPH = 15
+
+# The prompt for a race only needs its own pacing guide, its prep guide and the conditions guide
+DEFAULT_TOPICS = ("pacing", "prep", "conditions")
+
+HEADING = re.compile(r"^(#{1,3})\s+(.*)$")
+
+class Section(NamedTuple):
+    topic: str
+    file: str
+    title: str
+    heading: str
+    level: int
+    races: tuple[str, ...]
+    conditions: tuple[str, ...]
+    text: str
+
+def normalize_race(race: str) -> str:
+    normalized = RACE_ALIASES.get(race.lower().replace(" ", "_"))
+    if normalized is None:
+        raise ValueError(f"Unknown race: {race}")
+    return normalized
+
+def heading_races(heading: str) -> set[str]:
+    return {race for race, pattern in RACE_HEADING_PATTERNS.items() if pattern.search(heading)}
+
+def heading_conditions(heading: str) -> tuple[str, ...]:
+    return tuple(condition for condition, pattern in CONDITION_PATTERNS.items() if pattern.search(heading))
+
+# Guide -> sections split at every #, ## and ### heading. A section inherits the race narrowing
+# of its parent heading so "### Marathon: ..." under a generic heading still targets one race.
+def parse_guide(path: Path, topic: str) -> list[Section]:
+    file_races = FILE_RACES.get(path.name, RACES)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    title = next((match.group(2) for line in lines if (match := HEADING.match(line)) and len(match.group(1)) == 1), path.stem)
+
+    sections = []
+    parent_races = set(file_races)
+    heading, level, body = title, 1, []
+
+    def flush():
+        text = "\n".join(body).strip().removesuffix("---").strip()
+        races = heading_races(heading) & set(file_races) if level > 1 else set(file_races)
+        races = races or (parent_races if level > 2 else set(file_races))
+        conditions = heading_conditions(heading) if topic == "conditions" and level > 1 else ()
+        sections.append(Section(topic, path.name, title, heading, level, tuple(race for race in RACES if race in races), conditions, text))
+        return races
+
+    for line in lines:
+        match = HEADING.match(line)
+        if match is None:
+            body.append(line)
+            continue
+        if body or level > 1:
+            races = flush()
+            if level == 2: parent_races = races
+        heading, level, body = match.group(2), len(match.group(1)), [line]
+        if level == 2: parent_races = set(file_races)
+    flush()
+    return sections
+
+def weather_conditions(weather: WeatherConditions) -> tuple[str, ...]:
+    conditions = []
+    if weather.feels_like_f < COLD_F: conditions.append("cold")
+    if weather.feels_like_f > HOT_F: conditions.append("heat")
+    if weather.precipitation_mm > 0: conditions.append("rain")
+    if weather.wind_speed_mph >= WINDY_MPH: conditions.append("wind")
+    return tuple(conditions)
+
+# Every guide is parsed once into sections indexed by (topic, race) and heading. Rendered prompt
+# fragments are cached per (race, topics, conditions) and rebuilt only when a guide's mtime changes.
+class KnowledgeIndex:
+    def __init__(self, directory: str | Path = KNOWLEDGE_DIR):
+        self.directory = Path(directory)
+        self.guides: dict[Path, tuple[int, list[Section]]] = {}
+        self.index: dict[tuple[str, str], list[Section]] = {}
+        self.headings: dict[str, Section] = {}
+        self.prompts: dict[tuple, tuple[tuple, str]] = {}
+        self.directories: dict[Path, int] = {}
+        self.lock = threading.Lock()
+        self.refresh()
+
+    # Guide paths, only re-listed when a directory mtime shows a guide was added or removed
+    def guide_paths(self) -> list[Path]:
+        directories = {directory: directory.stat().st_mtime_ns for directory in [self.directory, *self.directories] if directory.exists()}
+        if directories != self.directories:
+            self.directories = {directory: directory.stat().st_mtime_ns for directory in [self.directory, *self.directory.iterdir()] if directory.is_dir()}
+            return sorted(self.directory.glob("*/*.md"))
+        return list(self.guides)
+
+    # Re-parse guides whose mtime changed, returns the (path, mtime) signature of the tree
+    def refresh(self) -> tuple:
+        with self.lock:
+            current = {path: path.stat().st_mtime_ns for path in self.guide_paths()}
+            changed = current.keys() != self.guides.keys() or any(self.guides[path][0] != mtime for path, mtime in current.items())
+            if changed:
+                self.guides = {
+                    path: self.guides[path] if path in self.guides and self.guides[path][0] == mtime else (mtime, parse_guide(path, path.parent.name))
+                    for path, mtime in current.items()
+                }
+                self.build_index()
+            return tuple(current.items())
+
+    def build_index(self) -> None:
+        self.index = {}
+        self.headings = {}
+        for _, sections in self.guides.values():
+            for section in sections:
+                for race in section.races:
+                    self.index.setdefault((section.topic, race), []).append(section)
+                self.headings[section.heading] = section
+
+    @property
+    def topics(self) -> list[str]:
+        return sorted({path.parent.name for path in self.guides})
+
+    def section(self, heading: str) -> Section | None:
+        self.refresh()
+        return self.headings.get(heading)
+
+    def sections(self, race: str, topics: tuple[str, ...] = DEFAULT_TOPICS, conditions: tuple[str, ...] | None = None) -> list[Section]:
+        race = normalize_race(race)
+        selected = []
+        for topic in topics:
+            for section in self.index.get((topic, race), []):
+                # None keeps every conditions section, otherwise only the general ones and the matching conditions
+                if conditions is not None and section.conditions and not set(section.conditions) & set(conditions):
+                    continue
+                selected.append(section)
+        return selected
+
+    def prompt(self, race: str, topics: tuple[str, ...] = DEFAULT_TOPICS, conditions: tuple[str, ...] | None = None) -> str:
+        key = (normalize_race(race), tuple(topics), None if conditions is None else tuple(sorted(conditions)))
+        signature = self.refresh()
+        cached = self.prompts.get(key)
+        if cached is not None and cached[0] == signature:
+            return cached[1]
+
+        text = render_sections(self.sections(*key))
+        self.prompts[key] = (signature, text)
+        return text
+
+def render_sections(sections: list[Section]) -> str:
+    blocks = []
+    current_file = None
+    for section in sections:
+        # Keep the guide title above its sections so the model knows where they come from
+        if section.file != current_file:
+            current_file = section.file
+            if section.level > 1: blocks.append(f"# {section.title}")
+        if section.text: blocks.append(section.text)
+    return "\n\n".join(blocks)
+
+KNOWLEDGE = KnowledgeIndex()
+
+def race_prompt(race: str, topics: tuple[str, ...] = DEFAULT_TOPICS, conditions: tuple[str, ...] | None = None) -> str:
+    return KNOWLEDGE.prompt(race, topics, conditions)
@@ -13,6 +13,46 @@ class SplitsResponse (BaseModel):
     splits: list[SplitEntry]
     avg_pace: float = Field(ge=0)
     pace_formatted: str
-    pace_strategy: Literal["even", "negative", "positive"]
+    pace_strategy: str
     goal_time_minutes: float = Field(ge=0)
     goal_time_formatted: str
+
+class AidStation (BaseModel):
+    mile: float = Field(ge=0)
+    water: bool = True
+    electrolyte: bool = False
+    gels: bool = False
+
+class GelEntry (BaseModel):
+    time_minutes: float = Field(ge=0)
+    time_formatted: str
+    mile: Optional[float] = Field(default=None, ge=0)
+    carbs_g: float = Field(ge=0)
+    caffeinated: bool = False
+    aid_station_mile: Optional[float] = None
+
+class HydrationEntry (BaseModel):
+    time_minutes: float = Field(ge=0)
+    mile: Optional[float] = Field(default=None, ge=0)
+    fluid_ml: float = Field(ge=0)
+    drink: Literal["water", "electrolyte"]
+    # Fluid the gap before this stop needs beyond what one stop can supply
+    carry_ml: float = Field(default=0, ge=0)
+    note: Optional[str] = None
+
+class AidStationPlan (BaseModel):
+    mile: float = Field(ge=0)
+    time_minutes: Optional[float] = Field(default=None, ge=0)
+    actions: list[str]
+
+class NutritionResponse (BaseModel):
+    expected_duration_minutes: float = Field(ge=0)
+    carbs_per_hour: float = Field(ge=0)
+    total_carbs_g: float = Field(ge=0)
+    fluid_ml_per_hour: float = Field(ge=0)
+    sodium_mg_per_hour: float = Field(ge=0)
+    gel_schedule: list[GelEntry]
+    hydration_schedule: list[HydrationEntry]
+    aid_station_plan: list[AidStationPlan]
+    carry_recommendations: list[str]
+    pre_race: list[str]
@@ -11,13 +11,9 @@ def format_time(total_minutes: float) -> str:
     seconds = int((total_minutes % 1) * 60)
     return f"{hours}:{minutes:02d}:{seconds:02d}"
 
-def format_mile_splits(splits: list[tuple[float, float]]) -> list[SplitEntry]:
+def format_mile_splits(distances, paces, cumulative_times) -> list[SplitEntry]:
     split_entry_list = []
-    cumulative_time = 0
-    for mile_num, (distance, pace) in enumerate(splits, start=1):
-        segment_time = distance * pace
-        cumulative_time += segment_time
-
+    for mile_num, (distance, pace, cumulative_time) in enumerate(zip(distances.tolist(), paces.tolist(), cumulative_times.tolist()), start=1):
         if distance < 1.0:
               mile_label = f"Finish ({distance:.1f}mi)"
         else:
@@ -30,4 +26,4 @@ def format_mile_splits(splits: list[tuple[float, float]]) -> list[SplitEntry]:
                                cumulative_time=cumulative_time,
                                cumulative_formatted=format_time(cumulative_time))
         split_entry_list.append(new_entry)
-    return split_entry_list
\ No newline at end of file
+    return split_entry_list
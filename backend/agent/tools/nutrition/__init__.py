@@ -0,0 +1 @@
+from .calculator import calculate_nutrition
\ No newline at end of file
@@ -0,0 +1,151 @@
+from functools import lru_cache
+import numpy as np
+from .helpers import (GEL_CARBS_G, AID_STATION_MATCH_MILES, HYDRATION_INTERVAL_MINUTES, CUP_ML, DEFAULT_TEMPERATURE_F,
+                      LATE_RACE_MINUTES, carbs_per_hour, fluid_ml_per_hour, sodium_mg_per_hour, gel_times, caffeinated_gels,
+                      race_knots, times_to_miles, miles_to_times, default_aid_station_miles, nearest_station, fluid_per_stop)
+from ..splits.helpers import generate_mile_distances, calculate_cumulative_times
+from ..formatters import format_time
+from ...models import AidStation, GelEntry, HydrationEntry, AidStationPlan, NutritionResponse
+
+MARATHON_MIN_MILES = 20
+
+# Standard spacing with water and electrolyte when the course is unknown
+@lru_cache(maxsize=32)
+def default_aid_stations(distance_miles: float) -> tuple[AidStation, ...]:
+    return tuple(AidStation(mile=mile, water=True, electrolyte=True) for mile in default_aid_station_miles(distance_miles).tolist())
+
+def parse_aid_stations(aid_stations: list[dict | AidStation] | None, distance_miles: float | None) -> list[AidStation]:
+    if aid_stations is None:
+        if distance_miles is None: return []
+        return list(default_aid_stations(distance_miles))
+    stations = [station if isinstance(station, AidStation) else AidStation(**station) for station in aid_stations]
+    return sorted(stations, key=lambda station: station.mile)
+
+@lru_cache(maxsize=128)
+def even_pace_knots(distance_miles: float, pace: float) -> tuple[np.ndarray, np.ndarray]:
+    distances = generate_mile_distances(distance_miles)
+    return race_knots(distances, calculate_cumulative_times(distances, np.full(len(distances), pace)))
+
+def splits_knots(distance_miles: float, cumulative_times: list[float]) -> tuple[np.ndarray, np.ndarray] | None:
+    distances = generate_mile_distances(distance_miles)
+    if len(cumulative_times) != len(distances): return None
+    return race_knots(distances, np.asarray(cumulative_times, dtype="float64"))
+
+def pre_race_guidance(duration_minutes: float, is_marathon: bool, fuels: bool) -> list[str]:
+    guidance = ["Eat a tested, high-carb, low-fiber breakfast 3-4 hours before the start"
+                + (" (at least 100g carbs)" if is_marathon else "")]
+    if fuels:
+        guidance.append("Begin drinking electrolytes 24 hours before the race")
+        guidance.append("Sip ~530ml water with an electrolyte tablet 3 hours before, urine should be light by the start")
+        guidance.append("Take 1 gel with a few sips of water 5-20 minutes before the start, it counts toward in-race carbs")
+    else:
+        guidance.append("Sip water until urine is light, no in-race fueling needed at this duration")
+    return guidance
+
+def carry_recommendations(gels: list[GelEntry], stations: list[AidStation], sodium: float, temperature_f: float, carry_fluid: bool) -> list[str]:
+    recommendations = []
+    if gels:
+        caffeinated = sum(gel.caffeinated for gel in gels)
+        recommendations.append(f"Carry {len(gels)} gels ({caffeinated} caffeinated), only products tested in training")
+        gel_stations = [station.mile for station in stations if station.gels]
+        if gel_stations:
+            recommendations.append(f"Gels are handed out at miles {', '.join(f'{mile:g}' for mile in gel_stations)}, use them only if you trained with them")
+    if sodium and not any(station.electrolyte for station in stations):
+        recommendations.append("Salt capsules or electrolyte tablets, the course has no electrolyte drink")
+    if (not stations and gels) or temperature_f >= 70 or carry_fluid:
+        recommendations.append("Handheld bottle to drink between stops")
+    return recommendations
+
+def calculate_nutrition(
+        expected_duration_minutes: float,
+        distance_miles: float | None = None,
+        temperature_f: float | None = None,
+        average_pace_per_mile: float | None = None,
+        aid_stations: list[dict | AidStation] | None = None,
+        cumulative_times: list[float] | None = None
+        ) -> NutritionResponse:
+    duration = float(expected_duration_minutes)
+    temperature_f = DEFAULT_TEMPERATURE_F if temperature_f is None else temperature_f
+    carbs_rate = carbs_per_hour(duration)
+    fluid_rate = fluid_ml_per_hour(temperature_f)
+    sodium = sodium_mg_per_hour(temperature_f, duration)
+    stations = parse_aid_stations(aid_stations, distance_miles)
+
+    # Time <-> mile mapping follows the splits engine: its cumulative times when given, else even pacing
+    knots = None
+    if distance_miles:
+        if cumulative_times is not None:
+            knots = splits_knots(distance_miles, cumulative_times)
+        if knots is None:
+            knots = even_pace_knots(distance_miles, average_pace_per_mile or duration / distance_miles)
+
+    # Gels
+    times = gel_times(duration, carbs_rate)
+    caffeinated = caffeinated_gels(times, duration)
+    miles = times_to_miles(times, *knots) if knots is not None else None
+    gel_miles = [None] * len(times) if miles is None else np.round(miles, 2).tolist()
+    caffeinated = caffeinated.tolist()
+    station_miles = np.array([station.mile for station in stations])
+    gel_station = None
+    if miles is not None and len(station_miles) and len(times):
+        index, gap = nearest_station(miles, station_miles)
+        gel_station = np.where(gap <= AID_STATION_MATCH_MILES, index, -1).tolist()
+
+    gel_schedule = [
+        GelEntry(time_minutes=time,
+                 time_formatted=format_time(time),
+                 mile=gel_miles[i],
+                 carbs_g=GEL_CARBS_G,
+                 caffeinated=caffeinated[i],
+                 aid_station_mile=None if gel_station is None or gel_station[i] < 0 else stations[gel_station[i]].mile)
+        for i, time in enumerate(times.tolist())
+    ]
+
+    # Hydration at drink stations, or on a timer without a course
+    drink_stations = [i for i, station in enumerate(stations) if station.water or station.electrolyte]
+    if knots is not None and drink_stations:
+        stop_miles = station_miles[drink_stations]
+        stop_times = miles_to_times(stop_miles, *knots)
+    else:
+        drink_stations = []
+        stop_times = np.arange(HYDRATION_INTERVAL_MINUTES, duration, HYDRATION_INTERVAL_MINUTES)
+        stop_miles = times_to_miles(stop_times, *knots) if knots is not None else None
+    fluids, carries = (np.round(values).tolist() for values in fluid_per_stop(stop_times, fluid_rate))
+    stop_miles = [None] * len(fluids) if stop_miles is None else np.round(stop_miles, 2).tolist()
+
+    hydration_schedule = []
+    for i, (time, fluid, carry) in enumerate(zip(stop_times.tolist(), fluids, carries)):
+        electrolyte = sodium > 0 and (stations[drink_stations[i]].electrolyte if drink_stations else True)
+        hydration_schedule.append(HydrationEntry(time_minutes=time,
+                                                 mile=stop_miles[i],
+                                                 fluid_ml=fluid,
+                                                 drink="electrolyte" if electrolyte else "water",
+                                                 carry_ml=carry,
+                                                 note=f"Carry fluid: sip ~{carry:g}ml on the way here, more than one stop can supply" if carry else None))
+
+    # Per-station actions
+    actions = {i: [] for i in range(len(stations))}
+    for entry, i in zip(hydration_schedule, drink_stations):
+        cups = max(1, round(entry.fluid_ml / CUP_ML))
+        actions[i].append(f"Drink {cups} cup{'s' if cups > 1 else ''} {entry.drink} (~{entry.fluid_ml:g}ml)")
+    if gel_station is not None:
+        for gel, i in zip(gel_schedule, gel_station):
+            if i >= 0:
+                actions[i].append("Take caffeinated gel with water" if gel.caffeinated else "Take gel with water")
+    station_times = miles_to_times(station_miles, *knots).tolist() if knots is not None and len(stations) else [None] * len(stations)
+    aid_station_plan = [
+        AidStationPlan(mile=station.mile, time_minutes=station_times[i], actions=actions[i] or ["Run through"])
+        for i, station in enumerate(stations)
+    ]
+
+    is_marathon = (distance_miles or 0) >= MARATHON_MIN_MILES or duration >= LATE_RACE_MINUTES
+    return NutritionResponse(expected_duration_minutes=duration,
+                             carbs_per_hour=carbs_rate,
+                             total_carbs_g=len(gel_schedule) * GEL_CARBS_G,
+                             fluid_ml_per_hour=fluid_rate,
+                             sodium_mg_per_hour=sodium,
+                             gel_schedule=gel_schedule,
+                             hydration_schedule=hydration_schedule,
+                             aid_station_plan=aid_station_plan,
+                             carry_recommendations=carry_recommendations(gel_schedule, stations, sodium, temperature_f, any(carries)),
+                             pre_race=pre_race_guidance(duration, is_marathon, bool(gel_schedule)))
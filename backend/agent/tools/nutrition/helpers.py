@@ -0,0 +1,92 @@
+import numpy as np
+
+# Constants from knowledge/nutrition/NUTRITION_GUIDE.md
+GEL_CARBS_G = 25
+NO_FUEL_MINUTES = 75            # Glycogen covers 60-90 minutes, 5K/10K efforts need no gels
+FIRST_GEL_MINUTES = 30          # Start fueling within the first 30 minutes
+LAST_GEL_BUFFER_MINUTES = 15    # A gel this close to the finish is not absorbed in time
+LATE_RACE_MINUTES = 180         # After 3 hours carbs go up to 60-90 g/hr
+LATE_RACE_CARBS_PER_HOUR = 60
+CAFFEINE_SECOND_HALF_MINUTES = 150  # Marathon-length races save caffeine for the second half
+
+# Faster finishers fuel at the top of the 30-60 g/hr range, 4-5 hour finishers at the bottom
+CARBS_PER_HOUR_DURATIONS = [90, 300]
+CARBS_PER_HOUR_RATES = [60, 30]
+
+# 300-800 ml/hr depending on conditions, sodium 700-900 mg/hr in longer races
+FLUID_TEMPERATURES_F = [50, 60, 70, 80]
+FLUID_ML_PER_HOUR = [400, 500, 650, 800]
+SODIUM_TEMPERATURES_F = [60, 80]
+SODIUM_MG_PER_HOUR = [700, 900]
+SODIUM_MIN_MINUTES = 90
+DEFAULT_TEMPERATURE_F = 55
+
+DEFAULT_AID_STATION_SPACING_MILES = 2.0
+HYDRATION_INTERVAL_MINUTES = 15     # Without a course, drink on a timer as fast as the stomach empties
+AID_STATION_MATCH_MILES = 1.0       # Only move a gel to an aid station this close
+CUP_ML = 100                        # Consumed from a ~150ml aid station cup
+MAX_STOP_ML = 2 * CUP_ML            # The stomach empties ~180-210ml per 15 minutes
+MIN_CARRY_ML = CUP_ML / 2           # Smaller shortfalls are not worth carrying a bottle for
+
+def carbs_per_hour(duration_minutes: float) -> float:
+    return float(np.interp(duration_minutes, CARBS_PER_HOUR_DURATIONS, CARBS_PER_HOUR_RATES))
+
+def fluid_ml_per_hour(temperature_f: float) -> float:
+    return float(np.interp(temperature_f, FLUID_TEMPERATURES_F, FLUID_ML_PER_HOUR))
+
+def sodium_mg_per_hour(temperature_f: float, duration_minutes: float) -> float:
+    if duration_minutes < SODIUM_MIN_MINUTES: return 0.0
+    return float(np.interp(temperature_f, SODIUM_TEMPERATURES_F, SODIUM_MG_PER_HOUR))
+
+# Gel k is taken once the carb target, integrated from the first gel, reaches k gels.
+# The target curve is piecewise linear so every gel time comes from one inverse interpolation.
+def gel_times(duration_minutes: float, base_carbs_per_hour: float) -> np.ndarray:
+    last_gel = duration_minutes - LAST_GEL_BUFFER_MINUTES
+    if duration_minutes < NO_FUEL_MINUTES or last_gel < FIRST_GEL_MINUTES:
+        return np.empty(0)
+
+    late_rate = max(base_carbs_per_hour, LATE_RACE_CARBS_PER_HOUR)
+    knots = np.array([FIRST_GEL_MINUTES, max(LATE_RACE_MINUTES, FIRST_GEL_MINUTES), max(last_gel, LATE_RACE_MINUTES)])
+    rates = np.array([base_carbs_per_hour, late_rate])
+    carbs = np.concatenate([[0.0], np.cumsum(np.diff(knots) / 60 * rates)])
+
+    gel_carbs = np.arange(0, carbs[-1] + 1e-9, GEL_CARBS_G)
+    times = np.interp(gel_carbs, carbs, knots)
+    return times[times <= last_gel]
+
+def caffeinated_gels(times: np.ndarray, duration_minutes: float) -> np.ndarray:
+    # Alternate caffeinated gels, only in the second half for marathon-length efforts
+    alternate = np.arange(len(times)) % 2 == 1
+    if duration_minutes >= CAFFEINE_SECOND_HALF_MINUTES:
+        return alternate & (times >= duration_minutes / 2)
+    return alternate
+
+# Split distances and cumulative finish times (splits engine output) -> interpolation knots
+def race_knots(distances: np.ndarray, cumulative_times: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    return np.concatenate([[0.0], cumulative_times]), np.concatenate([[0.0], np.cumsum(distances)])
+
+def times_to_miles(times: np.ndarray, knot_times: np.ndarray, knot_miles: np.ndarray) -> np.ndarray:
+    return np.interp(times, knot_times, knot_miles)
+
+def miles_to_times(miles: np.ndarray, knot_times: np.ndarray, knot_miles: np.ndarray) -> np.ndarray:
+    return np.interp(miles, knot_miles, knot_times)
+
+def default_aid_station_miles(distance_miles: float) -> np.ndarray:
+    return np.arange(DEFAULT_AID_STATION_SPACING_MILES, distance_miles, DEFAULT_AID_STATION_SPACING_MILES)
+
+# Index of the closest station for every mile, station_miles must be sorted
+def nearest_station(miles: np.ndarray, station_miles: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    right = np.clip(np.searchsorted(station_miles, miles), 1, len(station_miles) - 1) if len(station_miles) > 1 else np.zeros(len(miles), dtype=int)
+    left = np.maximum(right - 1, 0)
+    use_left = np.abs(miles - station_miles[left]) <= np.abs(station_miles[right] - miles)
+    index = np.where(use_left, left, right)
+    return index, np.abs(station_miles[index] - miles)
+
+# Fluid to drink at each stop: the hourly target over the gap before it, capped at what the
+# stomach can take at once. The rest of the gap's target is returned as fluid to carry.
+def fluid_per_stop(stop_times: np.ndarray, ml_per_hour: float) -> tuple[np.ndarray, np.ndarray]:
+    gaps = np.diff(np.concatenate([[0.0], stop_times]))
+    target = gaps / 60 * ml_per_hour
+    drink = np.minimum(target, MAX_STOP_ML)
+    carry = target - drink
+    return drink, np.where(carry >= MIN_CARRY_ML, carry, 0.0)
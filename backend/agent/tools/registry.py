@@ -0,0 +1,112 @@
+import hashlib
+import json
+from collections import Counter
+from typing import Annotated, Any, Callable, Literal, Optional
+from pydantic import BaseModel, ConfigDict, Field, create_model
+from cache import LRUCache
+from .schema import AGENT_TOOLS
+from .splits import calculate_splits
+from .nutrition import calculate_nutrition
+
+MEMO_SIZE = 256
+
+JSON_TYPES = {"string": str, "number": float, "integer": int, "boolean": bool}
+
+# JSON schema property -> python type for a pydantic field
+def schema_type(name: str, prop: dict) -> Any:
+    if "enum" in prop:
+        return Literal[tuple(prop["enum"])]
+    if prop["type"] == "array":
+        item = schema_type(f"{name}_item", prop.get("items", {"type": "number"}))
+        return Annotated[list[item], Field(min_length=prop.get("minItems"), max_length=prop.get("maxItems"))]
+    if prop["type"] == "object":
+        return schema_model(name.title().replace("_", ""), prop)
+    return JSON_TYPES[prop["type"]]
+
+def schema_model(name: str, schema: dict) -> type[BaseModel]:
+    required = set(schema.get("required", []))
+    fields = {
+        field: (schema_type(field, prop), ...) if field in required else (Optional[schema_type(field, prop)], None)
+        for field, prop in schema.get("properties", {}).items()
+    }
+    return create_model(name, __config__=ConfigDict(extra="forbid"), **fields)
+
+# Canonical JSON of the validated arguments so 240 / 240.0 and key order hit the same entry
+def arguments_key(name: str, arguments: dict) -> str:
+    canonical = json.dumps(arguments, sort_keys=True, separators=(",", ":"))
+    return f"{name}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+class Tool:
+    def __init__(self, schema: dict, function: Callable, argument_names: dict[str, str] | None = None):
+        self.schema = schema
+        self.name = schema["function"]["name"]
+        self.function = function
+        # Schema argument name -> python parameter name where they differ
+        self.argument_names = argument_names or {}
+        self.validator = schema_model(f"{self.name}_arguments", schema["function"]["parameters"])
+
+    def validate(self, arguments: dict) -> dict:
+        return self.validator.model_validate(arguments).model_dump(exclude_none=True)
+
+    def run(self, arguments: dict):
+        return self.function(**{self.argument_names.get(key, key): value for key, value in arguments.items()})
+
+# Binds AGENT_TOOLS schemas to their implementations. Validators are built once at registration,
+# results are memoized per tool + arguments. Cached results are shared, callers must not mutate them.
+class ToolRegistry:
+    def __init__(self, memo_size: int = MEMO_SIZE):
+        self.tools: dict[str, Tool] = {}
+        self.memo = LRUCache(memo_size)
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def register(self, schema: dict, function: Callable, argument_names: dict[str, str] | None = None) -> None:
+        tool = Tool(schema, function, argument_names)
+        self.tools[tool.name] = tool
+
+    @property
+    def schemas(self) -> list[dict]:
+        return [tool.schema for tool in self.tools.values()]
+
+    # Tool call from the model, arguments as a dict or the raw JSON string
+    def call(self, name: str, arguments: dict | str):
+        tool = self.tools.get(name)
+        if tool is None:
+            raise ValueError(f"Unknown tool: {name}")
+        if isinstance(arguments, str):
+            arguments = json.loads(arguments or "{}")
+
+        validated = tool.validate(arguments)
+        key = arguments_key(name, validated)
+        result = self.memo.get(key)
+        if result is not None:
+            self.hits[name] += 1
+            return result
+
+        self.misses[name] += 1
+        result = tool.run(validated)
+        self.memo.set(key, result)
+        return result
+
+    def clear(self) -> None:
+        self.memo.clear()
+
+    def stats(self) -> dict:
+        return {
+            name: {"hits": self.hits[name], "misses": self.misses[name]}
+            for name in self.tools
+        } | {"memo": self.memo.stats()}
+
+IMPLEMENTATIONS = {
+    "calculate_splits": (calculate_splits, {"elevation_adjustments": "elevation_adjustment"}),
+    "calculate_nutrition": (calculate_nutrition, None),
+}
+
+def build_registry(schemas: list[dict] = AGENT_TOOLS) -> ToolRegistry:
+    registry = ToolRegistry()
+    for schema in schemas:
+        function, argument_names = IMPLEMENTATIONS[schema["function"]["name"]]
+        registry.register(schema, function, argument_names)
+    return registry
+
+TOOL_REGISTRY = build_registry()
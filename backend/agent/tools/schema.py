@@ -23,9 +23,26 @@ CALCULATE_SPLITS_SCHEMA = {
             "properties": {
                 "pace_strategy": {
                     "type": "string",
-                    "enum": ["even", "negative", "positive"],
+                    "enum": ["even", "negative", "positive", "linear_negative", "linear_positive",
+                             "5k_conservative", "5k_aggressive", "10k_conservative", "10k_threshold",
+                             "half_conservative", "half_aggressive",
+                             "marathon_conservative", "marathon_autopilot", "marathon_hold_on"],
                     "description": "Mile splits progression even (consistent pace), negative "
-                                    "(start slower then increase pace), positive (start fast and hold on)"
+                                    "(start slower then increase pace), positive (start fast and hold on). "
+                                    "linear_* ramp the pace smoothly, the distance-prefixed strategies follow "
+                                    "the matching pacing guide in the knowledge base"
+                },
+                "pace_profile": {
+                    "type": "array",
+                    "minItems": 2,
+                    "items": {
+                        "type": "array",
+                        "items": {"type": "number"},
+                        "minItems": 2,
+                        "maxItems": 2
+                    },
+                    "description": "Optional custom pacing curve as [race fraction 0-1, pace multiplier] points, "
+                                    "overrides pace_strategy. Multipliers are rescaled so splits still add up to the goal time"
                 },
                 "goal_time_minutes": {
                     "type": "number",
@@ -87,6 +104,14 @@ CALCULATE_NUTRITION_SCHEMA = {
                     "type": "number",
                     "description": "Average pace per mile to calculate gel time to mile markers"
                 },
+                "cumulative_times": {
+                    "type": "array",
+                    "items": {
+                        "type": "number"
+                    },
+                    "description": "Optional cumulative_time of every split from calculate_splits, "
+                                    "maps gel times to miles following the pacing strategy instead of even pace"
+                },
                 "aid_stations": {
                     "type": "array",
                     "items": {
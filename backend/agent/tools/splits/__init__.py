@@ -1 +1 @@
-from .calculator import calculate_splits
\ No newline at end of file
+from .calculator import calculate_splits, calculate_splits_batch, SplitsMatrix
\ No newline at end of file
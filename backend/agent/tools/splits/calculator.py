@@ -1,30 +1,74 @@
-from .helpers import calculate_mile_pace, generate_mile_splits, apply_pace_strategy, apply_elevation_adjustments
+import numpy as np
+from .helpers import (calculate_mile_pace, generate_mile_distances, elevation_adjustment_array,
+                      calculate_split_paces, calculate_cumulative_times)
+from .strategies import compile_pace_strategy, piecewise_linear, PaceCurve
 from ..formatters import format_mile_splits, format_pace, format_time
 from ...models import SplitsResponse
-from typing import Literal
 
-def calculate_splits (
-        pace_strategy: Literal["even", "negative", "positive"],
-        goal_time_minutes: float,
+# Splits for many goal times / strategies over one course, held as arrays.
+# SplitEntry models are only built when a response is requested.
+class SplitsMatrix:
+    def __init__(self, goal_times, pace_strategies, distance_miles, distances, paces, cumulative_times):
+        self.goal_times = goal_times
+        self.pace_strategies = pace_strategies
+        self.distance_miles = distance_miles
+        self.distances = distances
+        self.paces = paces
+        self.cumulative_times = cumulative_times
+
+    def __len__(self) -> int:
+        return len(self.goal_times)
+
+    def response(self, index: int) -> SplitsResponse:
+        goal_time_minutes = float(self.goal_times[index])
+        avg_pace = calculate_mile_pace(self.distance_miles, goal_time_minutes)
+        return SplitsResponse(splits=format_mile_splits(self.distances, self.paces[index], self.cumulative_times[index]),
+                              avg_pace=avg_pace,
+                              pace_formatted=format_pace(avg_pace),
+                              pace_strategy=self.pace_strategies[index],
+                              goal_time_minutes=goal_time_minutes,
+                              goal_time_formatted=format_time(goal_time_minutes))
+
+    def responses(self) -> list[SplitsResponse]:
+        return [self.response(index) for index in range(len(self))]
+
+CUSTOM_STRATEGY = "custom"
+
+def strategy_name(pace_strategy: str | PaceCurve) -> str:
+    return pace_strategy if isinstance(pace_strategy, str) else CUSTOM_STRATEGY
+
+def calculate_splits_batch (
+        goal_times_minutes: list[float],
+        pace_strategies: list[str | PaceCurve] | str | PaceCurve,
         distance_miles: float,
         elevation_adjustment: list[float] | None = None
-        ):
-    avg_pace = calculate_mile_pace(distance_miles, goal_time_minutes)
-
-    splits = generate_mile_splits(distance_miles, avg_pace)
+        ) -> SplitsMatrix:
+    goal_times = np.asarray(goal_times_minutes, dtype="float64")
+    if isinstance(pace_strategies, str) or callable(pace_strategies):
+        pace_strategies = [pace_strategies] * len(goal_times)
+    if len(pace_strategies) != len(goal_times):
+        raise ValueError(f"Expected one pace strategy per goal time, got {len(pace_strategies)} strategies for {len(goal_times)} goal times")
 
-    apply_pace_strategy(splits, pace_strategy)
+    distances = generate_mile_distances(distance_miles)
+    # Compiled multiplier vectors are cached, gather one row per goal into an (n_goals, n_splits) matrix
+    multipliers = np.stack([compile_pace_strategy(strategy, distance_miles) for strategy in pace_strategies]) if len(goal_times) else np.empty((0, len(distances)))
 
-    if elevation_adjustment is not None: 
-        apply_elevation_adjustments(splits, elevation_adjustment=elevation_adjustment)
+    avg_paces = calculate_mile_pace(distance_miles, goal_times)
+    paces = calculate_split_paces(avg_paces, multipliers, elevation_adjustment_array(len(distances), elevation_adjustment))
+    cumulative_times = calculate_cumulative_times(distances, paces)
 
-    split_entry_list = format_mile_splits(splits)
+    return SplitsMatrix(goal_times, [strategy_name(strategy) for strategy in pace_strategies], distance_miles, distances, paces, cumulative_times)
 
-    response = SplitsResponse(splits=split_entry_list, 
-                              avg_pace=avg_pace, 
-                              pace_formatted=format_pace(avg_pace),
-                              pace_strategy=pace_strategy,
-                              goal_time_minutes=goal_time_minutes,
-                              goal_time_formatted=format_time(goal_time_minutes))
-    
-    return response
\ No newline at end of file
+def calculate_splits (
+        pace_strategy: str | PaceCurve,
+        goal_time_minutes: float,
+        distance_miles: float,
+        elevation_adjustment: list[float] | None = None,
+        pace_profile: list[list[float]] | None = None
+        ):
+    # A user-defined profile of [race fraction, pace multiplier] points overrides the named strategy
+    if pace_profile is not None:
+        if len(pace_profile) < 2 or any(len(point) != 2 for point in pace_profile):
+            raise ValueError(f"pace_profile needs at least two [race fraction, pace multiplier] points, got {pace_profile}")
+        pace_strategy = piecewise_linear(tuple(tuple(point) for point in pace_profile))
+    return calculate_splits_batch([goal_time_minutes], [pace_strategy], distance_miles, elevation_adjustment).response(0)
@@ -1,57 +1,32 @@
-from typing import Literal
+import numpy as np
 
 # Calculates average mile pace (min / mile) from distance and time 
 def calculate_mile_pace (distance_miles: float, goal_time_minutes: float) -> float:
     return goal_time_minutes / distance_miles
 
-# Returns a list with each mile's pace equal to the average pace
-def generate_mile_splits(distance_miles: float, avg_pace: float) -> list[tuple[float, float]]:
-    splits = []
-
-    # Full miles
-    for _ in range(int(distance_miles)):
-        splits.append((1.0, avg_pace))
-
-    # Partial miles
-    if not distance_miles.is_integer(): 
-        remaining_distance = distance_miles % 1
-        splits.append((remaining_distance, avg_pace))
-
-    return splits
-
-# Applies pacing strategy to a list of even splits at avg pace
-def apply_pace_strategy (
-        splits: list[tuple[float, float]], 
-        pace_strategy: Literal["even", "negative", "positive"]
-        ) -> None:
-    
-    starting_multiplier = 1
-    ending_multiplier = 1
-    if pace_strategy == "even": return splits
-    if pace_strategy == "positive": 
-        starting_multiplier = 0.98
-        ending_multiplier = 1.02
-    elif pace_strategy == "negative": 
-        starting_multiplier = 1.03
-        ending_multiplier = 0.97
-
-    multiplier = 1
-    # apply starting multiplier
-    for mile in range(len(splits)):
-        # Apply starting, standard, or ending multiplier depending on distance third
-        if (mile < len(splits) / 3): multiplier = starting_multiplier
-        elif (mile < 2 * len(splits) / 3): multiplier = 1
-        else: 
-            multiplier = ending_multiplier
-        distance, pace = splits[mile]
-        splits[mile] = (distance, pace * multiplier)
-
-# Apply adjustments in seconds to each mile split
-def apply_elevation_adjustments (
-        splits: list[tuple[float, float]],
-        elevation_adjustment: list[float]
-        ) -> None:
-    for mile in range(len(splits)):
-        if mile < len(elevation_adjustment):
-            distance, pace = splits[mile]
-            splits[mile] = (distance, pace + elevation_adjustment[mile] / 60)
\ No newline at end of file
+# Distance of each split: full miles, then the partial final mile if there is one
+def generate_mile_distances(distance_miles: float) -> np.ndarray:
+    distances = np.ones(int(distance_miles))
+    if not float(distance_miles).is_integer():
+        distances = np.append(distances, distance_miles % 1)
+    return distances
+
+# Pad or trim per-mile adjustments in seconds to one value per split
+def elevation_adjustment_array(num_splits: int, elevation_adjustment: list[float] | None) -> np.ndarray:
+    adjustments = np.zeros(num_splits)
+    if elevation_adjustment is not None:
+        count = min(num_splits, len(elevation_adjustment))
+        adjustments[:count] = elevation_adjustment[:count]
+    return adjustments
+
+# Paces (min / mile) for every goal time x split in one pass, shape (n_goals, n_splits)
+def calculate_split_paces(
+        avg_paces: np.ndarray,
+        multipliers: np.ndarray,
+        elevation_adjustment: np.ndarray
+        ) -> np.ndarray:
+    return avg_paces[:, np.newaxis] * multipliers + elevation_adjustment / 60
+
+# Running finish time after each split, shape (n_goals, n_splits)
+def calculate_cumulative_times(distances: np.ndarray, paces: np.ndarray) -> np.ndarray:
+    return np.cumsum(distances * paces, axis=-1)
@@ -0,0 +1,88 @@
+import numpy as np
+from functools import lru_cache
+from typing import Callable
+from .helpers import generate_mile_distances
+
+# A pacing curve maps the race fraction at each split's midpoint (0 = start, 1 = finish)
+# to a pace multiplier. Curves only describe shape: compiled multipliers are renormalized
+# so the splits always add back up to the goal time.
+PaceCurve = Callable[[np.ndarray], np.ndarray]
+
+def constant_curve(multiplier: float = 1.0) -> PaceCurve:
+    return lambda fractions: np.full(len(fractions), multiplier)
+
+# Starting / standard / ending multiplier by distance third
+def step_curve(starting_multiplier: float, ending_multiplier: float) -> PaceCurve:
+    return lambda fractions: np.where(fractions < 1 / 3, starting_multiplier,
+                                      np.where(fractions < 2 / 3, 1.0, ending_multiplier))
+
+def linear_ramp(starting_multiplier: float, ending_multiplier: float) -> PaceCurve:
+    return lambda fractions: starting_multiplier + (ending_multiplier - starting_multiplier) * fractions
+
+# Cached on the points so identical user profiles share one curve (and one compiled vector)
+@lru_cache(maxsize=128)
+def piecewise_linear(points: tuple[tuple[float, float], ...]) -> PaceCurve:
+    fractions, multipliers = zip(*sorted(points))
+    return lambda x: np.interp(x, fractions, multipliers)
+
+# Tabulated from the knowledge/pacing/*_STRATEGY.md pace deltas, converted from seconds per mile
+# to multipliers at a typical goal pace for the distance (5K 6:30, 10K 7:00, half 7:30, marathon 8:30)
+GUIDE_CURVES = {
+    # Mile 1 +5-10s, hold goal pace, last 0.6mi -10-15s
+    "5k_conservative": ((0.0, 1.019), (0.32, 1.019), (0.33, 1.0), (0.80, 1.0), (0.81, 0.968), (1.0, 0.968)),
+    # Mile 1 -5-10s, hold, likely +5s fade
+    "5k_aggressive": ((0.0, 0.981), (0.32, 0.981), (0.33, 1.0), (0.80, 1.0), (0.81, 1.013), (1.0, 1.013)),
+    # Miles 0-2 +5-10s, miles 2-5 goal pace, miles 5-6.2 -10-20s
+    "10k_conservative": ((0.0, 1.018), (0.32, 1.018), (0.33, 1.0), (0.80, 1.0), (0.81, 0.964), (1.0, 0.964)),
+    # Miles 0-2 -5-10s, hold to 5.5, likely +5s fade
+    "10k_threshold": ((0.0, 0.982), (0.32, 0.982), (0.33, 1.0), (0.88, 1.0), (0.89, 1.012), (1.0, 1.012)),
+    # Miles 0-3 +5-15s, 3-9 goal pace, 10-12 -5-10s, final 1.1mi kick
+    "half_conservative": ((0.0, 1.022), (0.23, 1.022), (0.25, 1.0), (0.69, 1.0), (0.76, 0.983), (0.91, 0.983), (0.92, 0.97), (1.0, 0.97)),
+    # Fast start -5-10s, hold, fade late
+    "half_aggressive": ((0.0, 0.983), (0.23, 0.983), (0.25, 1.0), (0.76, 1.0), (1.0, 1.03)),
+    # Miles 0-4 +10-15s, creep to goal pace by 20, then -5-10s
+    "marathon_conservative": ((0.0, 1.025), (0.15, 1.025), (0.76, 1.0), (0.78, 0.985), (1.0, 0.985)),
+    # Settle over miles 0-6, then autopilot at goal pace
+    "marathon_autopilot": ((0.0, 1.01), (0.23, 1.0), (1.0, 1.0)),
+    # Bank time to halfway, crash from mile 18
+    "marathon_hold_on": ((0.0, 0.98), (0.5, 0.98), (0.69, 1.0), (1.0, 1.04)),
+}
+
+PACE_STRATEGIES: dict[str, PaceCurve] = {
+    "even": constant_curve(),
+    "negative": step_curve(1.03, 0.97),
+    "positive": step_curve(0.98, 1.02),
+    "linear_negative": linear_ramp(1.03, 0.97),
+    "linear_positive": linear_ramp(0.98, 1.02),
+    **{name: piecewise_linear(points) for name, points in GUIDE_CURVES.items()},
+}
+
+def register_pace_strategy(name: str, curve: PaceCurve) -> None:
+    PACE_STRATEGIES[name] = curve
+    compile_pace_strategy.cache_clear()
+
+# Race fraction at the middle of each split
+def split_midpoints(distances: np.ndarray) -> np.ndarray:
+    return (np.cumsum(distances) - distances / 2) / distances.sum()
+
+# Rescale so the distance-weighted mean multiplier is exactly 1 (total time == goal time)
+def normalize_multipliers(multipliers: np.ndarray, distances: np.ndarray) -> np.ndarray:
+    return multipliers * distances.sum() / np.dot(distances, multipliers)
+
+# One multiplier per split, compiled once per (strategy, course distance) and shared read-only
+@lru_cache(maxsize=256)
+def compile_pace_strategy(pace_strategy: str | PaceCurve, distance_miles: float) -> np.ndarray:
+    if isinstance(pace_strategy, str):
+        if pace_strategy not in PACE_STRATEGIES:
+            raise ValueError(f"Unknown pace strategy: {pace_strategy}")
+        curve = PACE_STRATEGIES[pace_strategy]
+    else:
+        curve = pace_strategy
+    distances = generate_mile_distances(distance_miles)
+    multipliers = np.asarray(curve(split_midpoints(distances)), dtype="float64")
+    if multipliers.shape != distances.shape:
+        raise ValueError(f"Pace curve returned {multipliers.size} multipliers for {len(distances)} splits")
+
+    multipliers = normalize_multipliers(multipliers, distances)
+    multipliers.flags.writeable = False
+    return multipliers
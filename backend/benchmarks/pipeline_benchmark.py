@@ -0,0 +1,167 @@
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+from data_processing.processor import load_data, aggregate_weekly
+from data_processing.activity_store import clean_records
+from data_processing.clean_data import compact_activities, memory_per_activity
+from data_processing.categorize_activities import categorize_activities
+from data_processing.calculate_race_performances import calculate_race_performances
+from data_processing.profile_engine import IncrementalProfile
+from pipeline import NUMBER_OF_RECENT_WEEKS
+from .synthetic import write_activities
+
+# Run with: python -m benchmarks.pipeline_benchmark [--sizes 1000 10000 100000]  (from backend/)
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+DEFAULT_REPEATS = 5
+RESULTS_DIR = Path(__file__).parent / "results"
+STAGES = ["load_data", "clean_data", "categorize_activities", "aggregate_weekly", "calculate_race_performances"]
+
+# Each stage takes the previous stage's output. clean_data is timed through clean_records,
+# the pipeline's entry point into it (adds ids and types the columns before cleaning).
+def stage_functions(data_file: Path) -> dict:
+    return {
+        "load_data": lambda _: load_data(data_file),
+        "clean_data": clean_records,
+        "categorize_activities": categorize_activities,
+        "aggregate_weekly": aggregate_weekly,
+        "calculate_race_performances": lambda inputs: calculate_race_performances(*inputs),
+    }
+
+# Profile inputs are prepared outside the timed region, the stage itself is just the prediction
+def race_performance_inputs(df: pd.DataFrame) -> tuple:
+    engine = IncrementalProfile.from_activities(df)
+    now = df["start_date_local"].max().to_pydatetime()
+    return engine.recent_weeks(NUMBER_OF_RECENT_WEEKS, now), engine.coefficient_of_variance
+
+# categorize_activities writes into its argument, so every stage gets its own untouched frame
+def stage_inputs(data_file: Path) -> dict:
+    raw = load_data(data_file)
+    cleaned = clean_records(raw.copy())
+    categorized = categorize_activities(cleaned.copy())
+    return {
+        "load_data": None,
+        "clean_data": raw,
+        "categorize_activities": cleaned,
+        "aggregate_weekly": categorized,
+        "calculate_race_performances": race_performance_inputs(categorized),
+    }
+
+# A fresh copy per call (made outside the timed region) so no repeat sees a previous run's writes
+def fresh(stage_input):
+    return stage_input.copy() if isinstance(stage_input, pd.DataFrame) else stage_input
+
+def time_stage(function, stage_input, repeats: int) -> dict:
+    durations = []
+    for _ in range(repeats):
+        run_input = fresh(stage_input)
+        start = time.perf_counter()
+        function(run_input)
+        durations.append(time.perf_counter() - start)
+    return {"min_s": min(durations), "median_s": statistics.median(durations), "repeats": repeats}
+
+# Separate pass under tracemalloc (it slows allocation down too much to time with it on)
+def peak_memory(function, stage_input) -> int:
+    stage_input = fresh(stage_input)
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        function(stage_input)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+def benchmark_size(count: int, repeats: int, workdir: Path, seed: int = 0) -> dict:
+    data_file = write_activities(workdir / f"activities_{count}.json", count, seed)
+    functions = stage_functions(data_file)
+    inputs = stage_inputs(data_file)
+
+    stages = {}
+    for stage in STAGES:
+        stages[stage] = time_stage(functions[stage], inputs[stage], repeats)
+        stages[stage]["peak_memory_bytes"] = peak_memory(functions[stage], inputs[stage])
+    lean = categorize_activities(compact_activities(inputs["categorize_activities"]), lean=True)
+    return {
+        "activities": count,
+        "runs": len(inputs["categorize_activities"]),
+        "file_bytes": data_file.stat().st_size,
+        "stages": stages,
+        # Deep bytes per run of the categorized frame, default dtypes vs lean mode
+        "memory_per_activity": {
+            "default": memory_per_activity(inputs["aggregate_weekly"]),
+            "lean": memory_per_activity(lean),
+        },
+        "total_min_s": sum(stage["min_s"] for stage in stages.values()),
+    }
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=Path(__file__).parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmarks(sizes: list[int], repeats: int = DEFAULT_REPEATS, seed: int = 0) -> dict:
+    with tempfile.TemporaryDirectory() as workdir:
+        results = [benchmark_size(count, repeats, Path(workdir), seed) for count in sizes]
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": seed,
+        "results": results,
+    }
+
+# Stage-by-stage min time ratio against an earlier results file (> 1 is slower)
+def compare(current: dict, baseline: dict) -> list[str]:
+    lines = []
+    previous = {result["activities"]: result for result in baseline["results"]}
+    for result in current["results"]:
+        before = previous.get(result["activities"])
+        if before is None: continue
+        for stage in STAGES:
+            now_s, then_s = result["stages"][stage]["min_s"], before["stages"][stage]["min_s"]
+            lines.append(f"{result['activities']:>7} {stage:<28} {then_s * 1000:>10.2f}ms -> {now_s * 1000:>10.2f}ms  x{now_s / then_s:.2f}")
+    return lines
+
+def summary(report: dict) -> list[str]:
+    lines = [f"commit {report['commit']}  python {report['python']}  pandas {report['pandas']}"]
+    for result in report["results"]:
+        memory = result["memory_per_activity"]
+        lines.append(f"{result['activities']:>7} memory per activity {memory['default']:.0f}B (lean {memory['lean']:.0f}B)")
+        for stage, stats in result["stages"].items():
+            lines.append(f"{result['activities']:>7} {stage:<28} {stats['min_s'] * 1000:>10.2f}ms  peak {stats['peak_memory_bytes'] / 2**20:>8.1f}MiB")
+    return lines
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time and memory-profile each data processing stage on synthetic athletes")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=DEFAULT_REPEATS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="Results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="Earlier results file to compare against")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.sizes, args.repeats, args.seed)
+    output = args.output or RESULTS_DIR / f"{report['commit'] or 'working'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n".join(summary(report)))
+    if args.compare:
+        with open(args.compare, "r") as f:
+            print("\n".join(compare(report, json.load(f))))
+    print(f"Results written to {output}")
@@ -0,0 +1,124 @@
+import json
+import numpy as np
+from datetime import datetime, timedelta
+from pathlib import Path
+
+METERS_PER_MILE = 1609.34
+ACTIVITIES_PER_DAY = 0.9
+END_DATE = datetime(2026, 1, 1, 6, 0, 0)
+UTC_OFFSET = timedelta(hours=-5)
+
+# Kinds of activity in a typical runner's Strava history:
+#   share, names, Strava workout_type codes (with probabilities), distance (miles), pace (min / mile)
+ACTIVITY_KINDS = {
+    "easy": {
+        "share": 0.45,
+        "names": ["Morning Run", "Afternoon Run", "Evening Run", "Easy 6", "Recovery jog", "Zone 2 run", "Shakeout"],
+        "workout_types": ([None, 0], [0.3, 0.7]),
+        "distance": ("lognormal", np.log(5.0), 0.3),
+        "pace": (9.0, 0.6),
+    },
+    "long": {
+        "share": 0.10,
+        "names": ["Long Run", "Sunday long run", "LR with the crew", "Morning Run"],
+        "workout_types": ([None, 0, 2], [0.2, 0.3, 0.5]),
+        "distance": ("uniform", 11.0, 22.0),
+        "pace": (9.2, 0.5),
+    },
+    "workout": {
+        "share": 0.12,
+        "names": ["Tempo", "6x800 repeats", "Threshold intervals", "Fartlek", "Progression run", "Race pace miles", "12x400"],
+        "workout_types": ([None, 0, 3], [0.1, 0.3, 0.6]),
+        "distance": ("uniform", 5.0, 10.0),
+        "pace": (7.3, 0.4),
+    },
+    "race": {
+        "share": 0.03,
+        "names": ["Turkey Trot 5K", "Park run 5k PR", "10K race", "Half Marathon", "City Marathon", "Race day"],
+        "workout_types": ([0, 1], [0.3, 0.7]),
+        "distance": ("choice", [3.11, 6.21, 13.11, 26.22]),
+        "pace": (6.9, 0.4),
+    },
+    "warmup_cooldown": {
+        "share": 0.18,
+        "names": ["WU", "CD", "Warm up", "Cool down", "Morning Run"],
+        "workout_types": ([None, 0], [0.4, 0.6]),
+        "distance": ("uniform", 0.8, 2.5),
+        "pace": (10.0, 0.7),
+    },
+    "other": {
+        "share": 0.12,
+        "names": ["Morning Ride", "Lunch Swim", "Evening Walk", "Weight Training"],
+        "types": ["Ride", "Swim", "Walk", "WeightTraining"],
+        "workout_types": ([None], [1.0]),
+        "distance": ("uniform", 1.0, 25.0),
+        "pace": (5.0, 1.0),
+    },
+}
+
+def sample_distances(rng: np.random.Generator, spec: tuple, n: int) -> np.ndarray:
+    kind, *params = spec
+    if kind == "lognormal": return rng.lognormal(params[0], params[1], n)
+    if kind == "uniform": return rng.uniform(params[0], params[1], n)
+    return rng.choice(params[0], n)
+
+# Strava-shaped summary activities (same keys as GET /athlete/activities), oldest first
+def generate_activities(count: int, seed: int = 0, athlete_id: int = 1) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    kind_names = list(ACTIVITY_KINDS)
+    kinds = rng.choice(len(kind_names), count, p=[ACTIVITY_KINDS[kind]["share"] for kind in kind_names])
+
+    distances = np.empty(count)
+    paces = np.empty(count)
+    for index, kind in enumerate(kind_names):
+        mask = kinds == index
+        spec = ACTIVITY_KINDS[kind]
+        distances[mask] = sample_distances(rng, spec["distance"], mask.sum())
+        paces[mask] = rng.normal(*spec["pace"], mask.sum())
+    paces = np.clip(paces, 4.5, 16.0)
+
+    moving_times = np.round(distances * paces * 60)
+    elapsed_times = np.round(moving_times * (1 + rng.exponential(0.05, count)))
+    elevation = distances * rng.lognormal(np.log(12), 0.6, count)
+    heartrates = np.where(rng.random(count) < 0.15, np.nan, 150 + (8.5 - paces) * 8 + rng.normal(0, 5, count))
+
+    span_days = count / ACTIVITIES_PER_DAY
+    offsets = np.sort(rng.uniform(0, span_days, count))
+    start = END_DATE - timedelta(days=span_days)
+    name_picks = rng.random(count)
+    type_picks = rng.random(count)
+
+    activities = []
+    for i in range(count):
+        kind = ACTIVITY_KINDS[kind_names[kinds[i]]]
+        names = kind["names"]
+        activity_type = kind["types"][int(type_picks[i] * len(kind["types"]))] if "types" in kind else "Run"
+        codes, weights = kind["workout_types"]
+        workout_type = codes[np.searchsorted(np.cumsum(weights), type_picks[i], side="right").clip(max=len(codes) - 1)]
+        local = start + timedelta(days=float(offsets[i]))
+        activities.append({
+            "resource_state": 2,
+            "athlete": {"id": athlete_id, "resource_state": 1},
+            "name": names[int(name_picks[i] * len(names))],
+            "distance": round(float(distances[i] * METERS_PER_MILE), 1),
+            "moving_time": int(moving_times[i]),
+            "elapsed_time": int(elapsed_times[i]),
+            "total_elevation_gain": round(float(elevation[i]), 1),
+            "type": activity_type,
+            "sport_type": activity_type,
+            "workout_type": workout_type,
+            "id": 10_000_000 + i,
+            "start_date": (local - UTC_OFFSET).isoformat(timespec="seconds") + "Z",
+            "start_date_local": local.isoformat(timespec="seconds") + "Z",
+            "timezone": "(GMT-05:00) America/New_York",
+            "average_heartrate": None if np.isnan(heartrates[i]) else round(float(heartrates[i]), 1),
+            "map": {"id": f"a{10_000_000 + i}", "summary_polyline": "", "resource_state": 2},
+        })
+    return activities
+
+def write_activities(path: str | Path, count: int, seed: int = 0) -> Path:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(generate_activities(count, seed), f, separators=(",", ":"))
+    return path
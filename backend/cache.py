@@ -0,0 +1,125 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from storage import atomic_write_json
+
+# In-memory LRU with optional per-entry expiry (seconds since the epoch)
+class LRUCache:
+    def __init__(self, maxsize: int = 128, clock=time.time):
+        self.maxsize = maxsize
+        self.clock = clock
+        self.entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, expires_at: float | None = None) -> None:
+        with self.lock:
+            self.entries[key] = (value, expires_at)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self.entries), "maxsize": self.maxsize}
+
+# How often set() sweeps the directory for expired entries
+PRUNE_INTERVAL_SECONDS = 60 * 60
+
+# One JSON file per key, written atomically so concurrent workers never read a torn entry
+class DiskCache:
+    def __init__(self, directory: str | Path, clock=time.time, prune_interval: float = PRUNE_INTERVAL_SECONDS):
+        self.directory = Path(directory)
+        self.clock = clock
+        self.prune_interval = prune_interval
+        self.pruned_at = None
+
+    def path(self, key: str) -> Path:
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()[:32]}.json"
+
+    def is_expired(self, entry: dict) -> bool:
+        return entry["expires_at"] is not None and entry["expires_at"] <= self.clock()
+
+    # (value, expires_at) for a live entry, None when missing or expired (expired files are removed)
+    def get_entry(self, key: str) -> tuple | None:
+        path = self.path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        if entry["key"] != key: return None
+        if self.is_expired(entry):
+            path.unlink(missing_ok=True)
+            return None
+        return (entry["value"], entry["expires_at"])
+
+    def get(self, key: str, default=None):
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def set(self, key: str, value, expires_at: float | None = None) -> None:
+        atomic_write_json(self.path(key), {"key": key, "expires_at": expires_at, "value": value})
+        if self.pruned_at is None or self.clock() - self.pruned_at >= self.prune_interval:
+            self.prune()
+
+    # Delete expired entries, including keys that are never read again (e.g. old forecast coordinates)
+    def prune(self) -> int:
+        self.pruned_at = self.clock()
+        removed = 0
+        for path in self.directory.glob("*.json"):
+            try:
+                with open(path, "r") as f:
+                    expired = self.is_expired(json.load(f))
+            except (FileNotFoundError, json.JSONDecodeError, KeyError, TypeError):
+                continue
+            if expired:
+                path.unlink(missing_ok=True)
+                removed += 1
+        return removed
+
+# Memory in front of disk: hits are served from the LRU, disk hits are promoted into it
+class LayeredCache:
+    def __init__(self, memory: LRUCache, disk: DiskCache):
+        self.memory = memory
+        self.disk = disk
+
+    def get(self, key: str, default=None):
+        value = self.memory.get(key)
+        if value is not None: return value
+
+        entry = self.disk.get_entry(key)
+        if entry is None: return default
+
+        # Keep the disk expiry when promoting so the memory copy cannot outlive it
+        value, expires_at = entry
+        self.memory.set(key, value, expires_at)
+        return value
+
+    def set(self, key: str, value, expires_at: float | None = None) -> None:
+        self.memory.set(key, value, expires_at)
+        self.disk.set(key, value, expires_at)
@@ -0,0 +1,145 @@
+import argparse
+import importlib
+import json
+import sys
+import time
+from datetime import date, datetime
+from pathlib import Path
+from profile_cache import PROFILE_DISK, profile_slot, current_profile
+from storage import source_signature
+
+# race-coach: python cli.py <sync|profile|splits|weather> (from backend/)
+# Only the standard library is imported up front. Each command imports the modules it needs when it
+# runs, and `profile` answers from the pipeline's profile slot without pandas (see profile_cache.py):
+# valid while the profile version, the file's size + mtime and the day (recent_weeks is relative to today) are unchanged.
+START = time.perf_counter()
+BACKEND_DIR = Path(__file__).parent
+DATA_FILE = BACKEND_DIR / "data" / "raw_activities.json"
+
+IMPORT_SECONDS: dict[str, float] = {}
+
+def timed_import(name: str):
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_SECONDS[name] = IMPORT_SECONDS.get(name, 0.0) + time.perf_counter() - start
+    return module
+
+def load_env() -> None:
+    timed_import("env").load_env()
+
+def print_json(value) -> None:
+    print(json.dumps(value, indent=2))
+
+# "3:30:00" / "45:10" (h:mm:ss / mm:ss) or plain minutes -> minutes
+def parse_goal_time(value: str) -> float:
+    parts = [float(part) for part in value.split(":")]
+    if len(parts) == 1: return parts[0]
+    if len(parts) == 2: return parts[0] + parts[1] / 60
+    if len(parts) == 3: return parts[0] * 60 + parts[1] + parts[2] / 60
+    raise argparse.ArgumentTypeError(f"Invalid goal time: {value}")
+
+def sync(args: argparse.Namespace) -> int:
+    load_env()
+    fetch_data = timed_import("fetch_data")
+    if args.all_athletes:
+        results = fetch_data.sync_athletes(fetch_data.discover_athletes())
+        print_json([result.model_dump() for result in results])
+        return int(any(result.error for result in results))
+
+    data_file = Path(args.data_file)
+    fetch_data.sync_activities(data_file=str(data_file), state_file=str(data_file.parent / "sync_state.json"))
+    return 0
+
+def profile(args: argparse.Namespace) -> int:
+    data_file = Path(args.data_file)
+
+    # Fast path: the pipeline's cached profile for an unchanged activity file, nothing beyond the standard library
+    if not args.refresh:
+        slot = PROFILE_DISK.get(profile_slot(data_file, args.lean))
+        cached = current_profile(slot, source_signature(str(data_file)), date.today().isoformat())
+        if cached is not None:
+            print_json(json.loads(cached))
+            return 0
+
+    # A miss builds through the pipeline, which refills the slot
+    pipeline = timed_import("pipeline")
+    runner_profile = pipeline.build_runner_profile(data_file, args.lean, use_cache=not args.refresh)
+    print_json(runner_profile.model_dump(mode="json"))
+    return 0
+
+def splits(args: argparse.Namespace) -> int:
+    elevation_adjustment = None
+    distance_miles = args.distance
+    if args.course:
+        course = timed_import("course").load_course_file(args.course)
+        elevation_adjustment = course.elevation_adjustment
+        distance_miles = distance_miles or course.distance_miles
+    if distance_miles is None:
+        raise SystemExit("splits: --distance is required without --course")
+
+    calculate_splits = timed_import("agent.tools.splits").calculate_splits
+    response = calculate_splits(args.strategy, args.goal_time, distance_miles, elevation_adjustment)
+    print(response.model_dump_json(indent=2))
+    return 0
+
+def weather(args: argparse.Namespace) -> int:
+    load_env()
+    weather_module = timed_import("weather")
+    city, state, country = weather_module.parse_location(args.location)
+    result = weather_module.get_race_weather(city, state, datetime.fromisoformat(args.date), country)
+    if result is None:
+        print("No forecast available (unknown location or race outside the 5-day window)", file=sys.stderr)
+        return 1
+
+    conditions, impact = result
+    print_json({"conditions": conditions.model_dump(mode="json"), "impact": impact.model_dump(mode="json")})
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="race-coach", description="Race coach command line")
+    parser.add_argument("--timings", action="store_true", help="Report import and run time on stderr")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sync_parser = commands.add_parser("sync", help="Fetch new Strava activities")
+    sync_parser.add_argument("--data-file", default=str(DATA_FILE))
+    sync_parser.add_argument("--all-athletes", action="store_true", help="Sync every athlete under data/athletes")
+    sync_parser.set_defaults(handler=sync)
+
+    profile_parser = commands.add_parser("profile", help="Print the runner profile (cached until the activity file changes)")
+    profile_parser.add_argument("--data-file", default=str(DATA_FILE))
+    profile_parser.add_argument("--lean", action="store_true", help="Build with the memory-lean DataFrame dtypes")
+    profile_parser.add_argument("--refresh", action="store_true", help="Rebuild even if a cached profile is current")
+    profile_parser.set_defaults(handler=profile)
+
+    splits_parser = commands.add_parser("splits", help="Mile splits for a goal time")
+    splits_parser.add_argument("goal_time", type=parse_goal_time, help="h:mm:ss, mm:ss or minutes")
+    splits_parser.add_argument("--distance", type=float, help="Race distance in miles")
+    splits_parser.add_argument("--strategy", default="even")
+    splits_parser.add_argument("--course", help="GPX / TCX file for grade-adjusted splits")
+    splits_parser.set_defaults(handler=splits)
+
+    weather_parser = commands.add_parser("weather", help="Race-day forecast and its pace impact")
+    weather_parser.add_argument("location", help='"City, ST" or "City, ST, Country"')
+    weather_parser.add_argument("date", help="Race start, ISO 8601 local time (2026-04-20T10:00)")
+    weather_parser.set_defaults(handler=weather)
+    return parser
+
+def report_timings(run_seconds: float) -> None:
+    imports = ", ".join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in IMPORT_SECONDS.items()) or "none"
+    print(f"imports: {imports} | total {(time.perf_counter() - START) * 1000:.1f}ms "
+          f"(command {run_seconds * 1000:.1f}ms)", file=sys.stderr)
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    start = time.perf_counter()
+    try:
+        return args.handler(args)
+    except (ValueError, FileNotFoundError) as e:
+        # Missing API keys, token files or activity data: a one-line message instead of a traceback
+        print(f"race-coach {args.command}: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if args.timings: report_timings(time.perf_counter() - start)
+
+if __name__ == "__main__":
+    sys.exit(main())
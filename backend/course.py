@@ -0,0 +1,175 @@
+import hashlib
+import json
+import numpy as np
+from array import array
+from pathlib import Path
+from xml.parsers import expat
+from cache import LRUCache, DiskCache, LayeredCache
+from models import CourseProfile
+
+METERS_PER_MILE = 1609.34
+EARTH_RADIUS_METERS = 6371008.8
+CHUNK_SIZE = 1 << 16
+
+# Grade-adjusted pace: seconds per mile per 1% of grade. Downhills give back less than
+# uphills cost and stop helping past a point (knowledge/conditions/CONDITIONS_GUIDE.md)
+UPHILL_SECONDS_PER_PERCENT = 12.0
+DOWNHILL_SECONDS_PER_PERCENT = 7.0
+MAX_DOWNHILL_BENEFIT_GRADE = -8.0
+
+CACHE_DIR = Path(__file__).parent / "data" / "cache"
+COURSE_CACHE = LayeredCache(LRUCache(64), DiskCache(CACHE_DIR / "course"))
+
+# Streaming trackpoint reader on top of expat: only the current point's fields are ever held,
+# no element tree is built, so 50k-point marathon files parse in a single pass.
+class TrackpointParser:
+    def __init__(self, point_tag: str, attribute_fields: dict[str, str], text_fields: dict[str, str]):
+        self.point_tag = point_tag
+        self.attribute_fields = attribute_fields
+        self.text_fields = text_fields
+        self.columns = {field: array("d") for field in [*attribute_fields.values(), *text_fields.values()]}
+        self.point = None
+        self.text_field = None
+        self.text = []
+
+        self.parser = expat.ParserCreate()
+        self.parser.buffer_text = True
+        self.parser.StartElementHandler = self.start
+        self.parser.EndElementHandler = self.end
+        self.parser.CharacterDataHandler = self.characters
+
+    def start(self, name: str, attributes: dict) -> None:
+        tag = name.rsplit(":", 1)[-1]
+        if tag == self.point_tag:
+            self.point = {field: float(attributes[attribute]) for attribute, field in self.attribute_fields.items() if attribute in attributes}
+        elif self.point is not None and tag in self.text_fields:
+            self.text_field = self.text_fields[tag]
+            self.text = []
+
+    def characters(self, data: str) -> None:
+        if self.text_field is not None:
+            self.text.append(data)
+
+    def end(self, name: str) -> None:
+        tag = name.rsplit(":", 1)[-1]
+        if self.text_field is not None and tag in self.text_fields:
+            self.point[self.text_field] = float("".join(self.text))
+            self.text_field = None
+        elif tag == self.point_tag and self.point is not None:
+            for field, column in self.columns.items():
+                column.append(self.point.get(field, np.nan))
+            self.point = None
+
+    def feed(self, data: bytes, final: bool = False) -> None:
+        self.parser.Parse(data, final)
+
+    def arrays(self) -> dict[str, np.ndarray]:
+        return {field: np.frombuffer(column, dtype="float64") for field, column in self.columns.items()}
+
+def gpx_parser() -> TrackpointParser:
+    return TrackpointParser("trkpt", {"lat": "lat", "lon": "lon"}, {"ele": "altitude"})
+
+def tcx_parser() -> TrackpointParser:
+    return TrackpointParser(
+        "Trackpoint", {},
+        {"LatitudeDegrees": "lat", "LongitudeDegrees": "lon", "AltitudeMeters": "altitude", "DistanceMeters": "distance"}
+    )
+
+# Cumulative distance in meters along a lat/lon track (vectorized haversine)
+def cumulative_distance(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    lat, lon = np.radians(lat), np.radians(lon)
+    a = np.sin(np.diff(lat) / 2) ** 2 + np.cos(lat[:-1]) * np.cos(lat[1:]) * np.sin(np.diff(lon) / 2) ** 2
+    steps = 2 * EARTH_RADIUS_METERS * np.arcsin(np.sqrt(a))
+    return np.concatenate([[0.0], np.cumsum(steps)])
+
+# Elevation at every mile marker (and the finish), then the average grade of each split in percent
+def mile_grades(distance_meters: np.ndarray, altitude: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    total = distance_meters[-1]
+    boundaries = np.append(np.arange(0, total, METERS_PER_MILE), total)
+    elevations = np.interp(boundaries, distance_meters, altitude)
+    lengths = np.diff(boundaries)
+    return np.diff(elevations) / lengths * 100, lengths
+
+def grade_adjustments(grades: np.ndarray) -> np.ndarray:
+    return np.where(
+        grades >= 0,
+        grades * UPHILL_SECONDS_PER_PERCENT,
+        np.maximum(grades, MAX_DOWNHILL_BENEFIT_GRADE) * DOWNHILL_SECONDS_PER_PERCENT
+    )
+
+def build_course_profile(course_hash: str, distance_meters: np.ndarray, altitude: np.ndarray) -> CourseProfile:
+    # Drop points without altitude and any GPS jitter that runs distance backwards
+    valid = ~np.isnan(distance_meters) & ~np.isnan(altitude)
+    distance_meters, altitude = distance_meters[valid], altitude[valid]
+    order = np.argsort(distance_meters, kind="stable")
+    distance_meters, altitude = distance_meters[order], altitude[order]
+    if len(distance_meters) < 2 or distance_meters[-1] <= 0:
+        raise ValueError("Course needs at least two points with distance and altitude")
+
+    grades, _ = mile_grades(distance_meters, altitude)
+    climbs = np.diff(altitude)
+    return CourseProfile(
+        course_hash=course_hash,
+        distance_miles=distance_meters[-1] / METERS_PER_MILE,
+        mile_grades=grades.tolist(),
+        elevation_adjustment=grade_adjustments(grades).tolist(),
+        elevation_gain_m=float(climbs[climbs > 0].sum()),
+        elevation_loss_m=float(-climbs[climbs < 0].sum())
+    )
+
+def cached_course_profile(course_hash: str, build) -> CourseProfile:
+    cached = COURSE_CACHE.get(course_hash)
+    if cached is not None:
+        return CourseProfile(**cached)
+    profile = build()
+    COURSE_CACHE.set(course_hash, profile.model_dump())
+    return profile
+
+def file_hash(path: str | Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# GPX or TCX file -> per-mile grades and elevation_adjustment for calculate_splits
+def load_course_file(path: str | Path) -> CourseProfile:
+    path = Path(path)
+    if path.suffix.lower() not in (".gpx", ".tcx"):
+        raise ValueError(f"Unsupported course file: {path.name}")
+
+    def build() -> CourseProfile:
+        parser = tcx_parser() if path.suffix.lower() == ".tcx" else gpx_parser()
+        with open(path, "rb") as f:
+            while chunk := f.read(CHUNK_SIZE):
+                parser.feed(chunk)
+        parser.feed(b"", final=True)
+
+        points = parser.arrays()
+        distance = points.get("distance")
+        if distance is None or np.isnan(distance).all():
+            distance = cumulative_distance(points["lat"], points["lon"])
+        return build_course_profile(course_hash, distance, points["altitude"])
+
+    course_hash = file_hash(path)
+    return cached_course_profile(course_hash, build)
+
+# Strava activity streams (GET /activities/{id}/streams?keys=latlng,altitude,distance&key_by_type=true)
+def load_strava_streams(streams: dict) -> CourseProfile:
+    def stream(key: str):
+        value = streams.get(key)
+        return value["data"] if isinstance(value, dict) else value
+
+    course_hash = hashlib.sha256(json.dumps({key: stream(key) for key in ("latlng", "altitude", "distance")}).encode()).hexdigest()
+
+    def build() -> CourseProfile:
+        altitude = np.asarray(stream("altitude"), dtype="float64")
+        distance = stream("distance")
+        if distance is not None:
+            distance = np.asarray(distance, dtype="float64")
+        else:
+            latlng = np.asarray(stream("latlng"), dtype="float64")
+            distance = cumulative_distance(latlng[:, 0], latlng[:, 1])
+        return build_course_profile(course_hash, distance, altitude)
+
+    return cached_course_profile(course_hash, build)
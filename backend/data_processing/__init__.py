@@ -1,6 +1,8 @@
-from .processor import load_data, aggregate_weekly                         
-from .categorize_activities import categorize_activities  
-from .calculate_vdot import calculate_vdot
+from .processor import load_data, load_activities, aggregate_weekly                         
+from .categorize_activities import categorize_activities, classify_runs  
+from .calculate_vdot import calculate_vdot, calculate_vdot_column
 from .clean_data import clean_data
 from .calculate_consistency import calculate_consistency_penalty
-from .calculate_race_performances import calculate_race_performances
\ No newline at end of file
+from .calculate_race_performances import calculate_race_performances, predict_race_times
+from .activity_store import load_store, write_store, append_to_store, store_dir_for
+from .profile_engine import IncrementalProfile
\ No newline at end of file
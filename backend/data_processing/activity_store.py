@@ -0,0 +1,178 @@
+import json
+import shutil
+import uuid
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from storage import atomic_write_json, source_signature
+from instrumentation import instrumented
+from .clean_data import clean_data, DESIRED_COLUMNS
+from .ingest import runs_frame
+
+# Cleaned activities are stored one file per column so loading is a memory map instead of a JSON parse:
+#   numeric / datetime columns -> raw little-endian arrays (<col>.bin)
+#   string columns             -> UTF-8 text (<col>.txt) + character offsets (<col>.offsets)
+#   category columns           -> int16 codes (<col>.bin), categories listed in meta.json
+# meta.json is written last and atomically, it is the only source of truth for the row count.
+STORE_DIRNAME = "activity_store"
+META_FILE = "meta.json"
+STORE_COLUMNS = ["id"] + DESIRED_COLUMNS + ["mile_pace", "week_start", "vdot"]
+STRING_COLUMNS = ["name"]
+CATEGORY_COLUMNS = ["type"]
+INTEGER_COLUMNS = ["id"]
+DATETIME_COLUMNS = ["start_date_local", "week_start"]
+
+def store_dir_for(data_file: str | Path) -> Path:
+    return Path(data_file).parent / STORE_DIRNAME
+
+def read_meta(store_dir: str | Path) -> dict | None:
+    meta_path = Path(store_dir) / META_FILE
+    if not meta_path.exists(): return None
+    with open(meta_path, "r") as f:
+        return json.load(f)
+
+def is_store_current(store_dir: str | Path, source_file: str | Path) -> bool:
+    meta = read_meta(store_dir)
+    return meta is not None and meta["source"] == source_signature(source_file)
+
+# Clean raw Strava records into the stored layout (id + cleaned DESIRED_COLUMNS)
+@instrumented()
+def clean_records(raw_df: pd.DataFrame) -> pd.DataFrame:
+    raw_df = raw_df.reindex(columns=["id"] + DESIRED_COLUMNS)
+    raw_df = raw_df.loc[raw_df["type"] == "Run"]
+    if raw_df.empty:
+        return pd.DataFrame(columns=STORE_COLUMNS)
+
+    # Columns that are entirely missing in a batch come back as object dtype
+    for column in ["distance", "elapsed_time", "moving_time", "average_heartrate", "total_elevation_gain", "workout_type"]:
+        raw_df[column] = raw_df[column].astype("float64")
+
+    df = clean_data(raw_df)
+    df.insert(0, "id", raw_df.loc[df.index, "id"].astype("int64"))
+    return df.reset_index(drop=True)
+
+def column_spec(column: str, series: pd.Series) -> dict:
+    if column in STRING_COLUMNS: return {"kind": "string", "chars": 0, "bytes": 0}
+    if column in CATEGORY_COLUMNS: return {"kind": "category", "dtype": "<i2", "categories": []}
+    if column in DATETIME_COLUMNS:
+        dtype = str(series.dtype) if pd.api.types.is_datetime64_dtype(series) else "datetime64[us]"
+        return {"kind": "datetime", "dtype": dtype}
+    if column in INTEGER_COLUMNS: return {"kind": "numeric", "dtype": "<i8"}
+    return {"kind": "numeric", "dtype": "<f8"}
+
+def append_bytes(path: Path, data: bytes, keep_bytes: int) -> None:
+    # Drop any tail left by an interrupted append before writing the new rows
+    with open(path, "ab") as f:
+        f.truncate(keep_bytes)
+        f.write(data)
+
+def write_columns(df: pd.DataFrame, store_dir: Path, meta: dict) -> None:
+    rows = meta["rows"]
+    for column in STORE_COLUMNS:
+        spec = meta["columns"][column]
+        series = df[column]
+
+        if spec["kind"] == "string":
+            values = series.fillna("").astype(str).tolist()
+            text = "".join(values).encode()
+            offsets = spec["chars"] + np.cumsum([len(value) for value in values], dtype="<i8")
+            if rows == 0:
+                offsets = np.concatenate([np.zeros(1, dtype="<i8"), offsets])
+            append_bytes(store_dir / f"{column}.txt", text, spec["bytes"])
+            append_bytes(store_dir / f"{column}.offsets", offsets.tobytes(), (rows + 1) * 8 if rows else 0)
+            spec["chars"] = int(offsets[-1]) if len(offsets) else spec["chars"]
+            spec["bytes"] += len(text)
+            continue
+
+        if spec["kind"] == "category":
+            categories = spec["categories"]
+            for value in series.unique():
+                if value not in categories: categories.append(value)
+            values = pd.Categorical(series, categories=categories).codes.astype(spec["dtype"])
+        else:
+            values = series.to_numpy().astype(spec["dtype"])
+
+        append_bytes(store_dir / f"{column}.bin", values.tobytes(), rows * values.dtype.itemsize)
+
+def write_store(df: pd.DataFrame, store_dir: str | Path, source_file: str | Path | None = None) -> None:
+    store_dir = Path(store_dir)
+    if store_dir.exists():
+        shutil.rmtree(store_dir)
+    store_dir.mkdir(parents=True)
+
+    meta = {
+        "rows": 0,
+        "columns": {column: column_spec(column, df[column]) for column in STORE_COLUMNS},
+        "source": None
+    }
+    write_columns(df, store_dir, meta)
+    meta["rows"] = len(df)
+    meta["max_id"] = int(df["id"].max()) if len(df) else None
+    meta["version"] = uuid.uuid4().hex
+    meta["source"] = source_signature(source_file)
+    atomic_write_json(store_dir / META_FILE, meta)
+
+# Fingerprint of the stored activities from meta.json alone: count, newest id and a version token that
+# every rebuild / append replaces, so checking it never reads the column files. Touching the source
+# file without new data rebuilds the store and so changes the version (a cache miss, never a stale hit).
+def store_fingerprint(store_dir: str | Path) -> dict | None:
+    meta_path = Path(store_dir) / META_FILE
+    meta = read_meta(store_dir)
+    if meta is None: return None
+    # Stores written before versioning fall back to the meta file's mtime
+    version = meta.get("version") or str(meta_path.stat().st_mtime_ns)
+    return {"count": meta["rows"], "max_id": meta.get("max_id"), "version": version}
+
+@instrumented()
+def load_store(store_dir: str | Path, columns: list[str] | None = None) -> pd.DataFrame | None:
+    store_dir = Path(store_dir)
+    meta = read_meta(store_dir)
+    if meta is None: return None
+
+    rows = meta["rows"]
+    data = {}
+    for column in columns or STORE_COLUMNS:
+        spec = meta["columns"][column]
+
+        if spec["kind"] == "string":
+            with open(store_dir / f"{column}.txt", "rb") as f:
+                text = f.read(spec["bytes"]).decode()
+            offsets = np.fromfile(store_dir / f"{column}.offsets", dtype="<i8", count=rows + 1) if rows else [0]
+            data[column] = pd.Series([text[start:end] for start, end in zip(offsets[:-1], offsets[1:])], dtype="str")
+            continue
+
+        dtype = np.dtype(spec["dtype"])
+        if rows == 0:
+            values = np.empty(0, dtype=dtype)
+        else:
+            # Read-only memory map, pages are only touched when a column is used
+            values = np.memmap(store_dir / f"{column}.bin", dtype=dtype, mode="r", shape=(rows,)).view(np.ndarray)
+
+        if spec["kind"] == "category":
+            data[column] = pd.Categorical.from_codes(values, categories=spec["categories"]).astype("str")
+        else:
+            data[column] = values
+
+    return pd.DataFrame(data, copy=False)
+
+@instrumented()
+def append_to_store(raw_activities: list[dict], store_dir: str | Path, source_file: str | Path | None = None) -> int:
+    store_dir = Path(store_dir)
+    meta = read_meta(store_dir)
+    # Without a store there is nothing to extend, the next load rebuilds it from the source file
+    if meta is None or not raw_activities: return 0
+
+    df = clean_records(runs_frame(raw_activities))
+    if meta["rows"] and not df.empty:
+        stored_ids = np.memmap(store_dir / "id.bin", dtype="<i8", mode="r", shape=(meta["rows"],))
+        df = df.loc[~np.isin(df["id"].to_numpy(), stored_ids)]
+
+    if not df.empty:
+        write_columns(df, store_dir, meta)
+        meta["rows"] += len(df)
+        newest = int(df["id"].max())
+        meta["max_id"] = newest if meta.get("max_id") is None else max(meta["max_id"], newest)
+        meta["version"] = uuid.uuid4().hex
+    meta["source"] = source_signature(source_file)
+    atomic_write_json(store_dir / META_FILE, meta)
+    return len(df)
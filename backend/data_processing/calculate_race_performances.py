@@ -1,17 +1,26 @@
+import numpy as np
 import pandas as pd
+from functools import lru_cache
 from models import WeeklySummary, RacePrediction
+from instrumentation import instrumented
 from .calculate_consistency import calculate_consistency_penalty
 from .calculate_vdot import calculate_vo2_cost, calculate_percent_vo2_max
 
 RACE_DISTANCES = {"5K": 5000, "10K": 10000, "half_marathon": 21097.5, "marathon": 42195}
 
-def calculate_ideal_race_time(vdot_max: int, race_type: str):
+# Race time search window in minutes (same bounds as the bisection) and lookup table resolution
+MIN_RACE_TIME = 10.0
+MAX_RACE_TIME = 600.0
+TABLE_STEP_MINUTES = 0.01
+
+# Reference solver: bisects the VDOT formula, used to validate the lookup table
+def solve_ideal_race_time(vdot_max: int, race_type: str):
     distance_meters = RACE_DISTANCES[race_type]
     
     # VDOT is not a reversible formula, binary search for the proper time to hit that vdot
     # Start from 10 minutes (impossible 5K) to 10 hours (very slow marathon)
-    low_time = 10.0
-    high_time = 600.0
+    low_time = MIN_RACE_TIME
+    high_time = MAX_RACE_TIME
 
     # Binary search with a tolerance of 10s accuracy
     while (high_time - low_time) > 0.01:
@@ -26,6 +35,44 @@ def calculate_ideal_race_time(vdot_max: int, race_type: str):
 
     return (low_time + high_time) / 2
 
+# VDOT falls strictly as race time grows, so tabulating VDOT over a dense time grid gives its inverse.
+# Built lazily, once per distance.
+@lru_cache(maxsize=None)
+def vdot_time_table(race_type: str) -> tuple[np.ndarray, np.ndarray]:
+    distance_meters = RACE_DISTANCES[race_type]
+    times = np.arange(MIN_RACE_TIME, MAX_RACE_TIME + TABLE_STEP_MINUTES / 2, TABLE_STEP_MINUTES)
+    vdots = calculate_vo2_cost(distance_meters / times) / calculate_percent_vo2_max(times)
+
+    # np.interp needs ascending x values
+    vdots, times = vdots[::-1].copy(), times[::-1].copy()
+    vdots.flags.writeable = False
+    times.flags.writeable = False
+    return vdots, times
+
+# Predicted race times (minutes) for any number of VDOTs, clamped to the search window
+def predict_race_times(vdots, race_type: str) -> np.ndarray:
+    table_vdots, table_times = vdot_time_table(race_type)
+    vdots = np.clip(np.asarray(vdots, dtype="float64"), table_vdots[0], table_vdots[-1])
+
+    # Linear interpolation between the bracketing table entries (searchsorted is O(log n) per
+    # query, np.interp rescans the table on every scalar call)
+    upper = np.clip(np.searchsorted(table_vdots, vdots), 1, len(table_vdots) - 1)
+    lower = upper - 1
+    weight = (vdots - table_vdots[lower]) / (table_vdots[upper] - table_vdots[lower])
+    return table_times[lower] + weight * (table_times[upper] - table_times[lower])
+
+def calculate_ideal_race_time(vdot_max: int, race_type: str) -> float:
+    return float(predict_race_times(vdot_max, race_type))
+
+# Worst-case interpolation error of the table in minutes. Grid midpoints have a known exact
+# inverse (the midpoint itself), and linear interpolation error peaks between grid points.
+def vdot_table_max_error(race_type: str) -> float:
+    distance_meters = RACE_DISTANCES[race_type]
+    midpoints = np.arange(MIN_RACE_TIME, MAX_RACE_TIME, TABLE_STEP_MINUTES) + TABLE_STEP_MINUTES / 2
+    vdots = calculate_vo2_cost(distance_meters / midpoints) / calculate_percent_vo2_max(midpoints)
+    return float(np.max(np.abs(predict_race_times(vdots, race_type) - midpoints)))
+
+@instrumented()
 def calculate_race_performances(recent_weeks: list[WeeklySummary], cv: float) -> list[RacePrediction] | None:
     weekly_training = recent_weeks
     if not recent_weeks: return None
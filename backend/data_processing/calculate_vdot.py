@@ -1,5 +1,6 @@
 import pandas as pd
 import numpy as np
+from instrumentation import instrumented
 
 METERS_PER_MILE = 1609.34
 
@@ -22,4 +23,20 @@ def calculate_vdot(row):
     vo2_cost = calculate_vo2_cost(velocity_meters_per_min)
     percent_vo2_max = calculate_percent_vo2_max(time_minutes)
 
-    return vo2_cost / percent_vo2_max
\ No newline at end of file
+    return vo2_cost / percent_vo2_max
+
+# Column-wise calculate_vdot: the same exclusion rules applied as masks over the whole frame
+@instrumented()
+def calculate_vdot_column(df: pd.DataFrame) -> pd.Series:
+    distance_meters = df["distance"].to_numpy(dtype="float64") * METERS_PER_MILE
+    time_minutes = df["moving_time"].to_numpy(dtype="float64")
+    elapsed_minutes = df["elapsed_time"].to_numpy(dtype="float64")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rest_ratio = (elapsed_minutes - time_minutes) / time_minutes
+        velocity_meters_per_min = distance_meters / time_minutes
+        vdot = calculate_vo2_cost(velocity_meters_per_min) / calculate_percent_vo2_max(time_minutes)
+
+    # Same order as calculate_vdot: too short, then too much rest (NaN comparisons fall through)
+    excluded = (time_minutes < 3.5) | (rest_ratio > 0.2)
+    return pd.Series(np.where(excluded, np.nan, vdot), index=df.index, dtype="float64")
@@ -1,4 +1,7 @@
+import re
+import numpy as np
 import pandas as pd
+from instrumentation import instrumented
 
 RACE_DISTANCES = {"5K": 3.1, "10K": 6.2, "15K": 9.3, "10 mile": 10.0, "half": 13.1, "marathon": 26.2, "50K": 31.1, "50 mile": 50.0, "100K": 62.1, "100 mile": 100.0,}   
 RACE_DISTANCE_KEYWORDS = ["5k", "10k", "half", "marathon", "mile"]
@@ -14,6 +17,7 @@ EASY_DISTANCE_PERCENTILE = 0.50
 
 WARMUP_COOLDOWN_DISTANCE = 1.0
 workout_type = {None: "None", 0: "None", 1: "Race", 2: "Long Run", 3: "Workout", 4: "Warmup/Cooldown"}
+WORKOUT_LABELS = ["None", "Race", "Long Run", "Workout", "Warmup/Cooldown", "Easy Run"]
 
 def is_race_distance(miles: int):
     for race_miles in RACE_DISTANCES.values():                               
@@ -59,7 +63,54 @@ def classify_run(row):
     # Failed to classify / regular run
     return "None"
 
-def categorize_activities(df: pd.DataFrame) -> pd.DataFrame: 
+# One precompiled alternation per keyword list, equivalent to has_keyword's substring scan
+def compile_keywords(keywords: list) -> re.Pattern:
+    return re.compile("|".join(re.escape(keyword) for keyword in keywords))
+
+RACE_DISTANCE_PATTERN = compile_keywords(RACE_DISTANCE_KEYWORDS)
+RACE_PATTERN = compile_keywords(RACE_KEYWORDS)
+WORKOUT_PATTERN = compile_keywords(WORKOUT_KEYWORDS)
+WARMUP_COOLDOWN_PATTERN = compile_keywords(WARMUP_COOLDOWN_KEYWORDS)
+EASY_RUN_PATTERN = compile_keywords(EASY_RUN_KEYWORDS)
+LONG_RUN_PATTERN = compile_keywords(["long run"])
+RACE_MILES = np.array(list(RACE_DISTANCES.values()))
+
+# Vectorized is_race_distance: compare every run against every race distance at once
+def is_race_distance_column(miles: pd.Series) -> np.ndarray:
+    miles = miles.to_numpy(dtype="float64")[:, np.newaxis]
+    return (np.abs(miles - RACE_MILES) <= (RACE_MILES * 0.1)).any(axis=1)
+
+# Batch version of classify_run, conditions are listed in the same precedence order
+def classify_runs(df: pd.DataFrame) -> pd.Series:
+    names = df["name"].str.lower()
+    def has_keywords(pattern: re.Pattern) -> np.ndarray:
+        return names.str.contains(pattern).fillna(False).to_numpy(dtype=bool)
+
+    tag = df["workout_type"].to_numpy(dtype=object)
+    pace_percentile = pd.to_numeric(df["pace_percentile"]).to_numpy(dtype="float64", na_value=np.nan)
+    distance_percentile = pd.to_numeric(df["distance_percentile"]).to_numpy(dtype="float64", na_value=np.nan)
+    is_fast = pace_percentile >= FAST_RUN_PERCENTILE
+    is_easy = distance_percentile <= EASY_DISTANCE_PERCENTILE
+
+    rules = [
+        (tag != "None", tag),
+        (has_keywords(WORKOUT_PATTERN), "Workout"),
+        (has_keywords(WARMUP_COOLDOWN_PATTERN), "Warmup/Cooldown"),
+        (df["is_warmup_cooldown"].to_numpy(dtype=bool), "Warmup/Cooldown"),
+        (has_keywords(EASY_RUN_PATTERN), "Easy Run"),
+        (is_easy & (pace_percentile <= WORKOUT_RUN_PERCENTILE), "Easy Run"),
+        (has_keywords(RACE_PATTERN), "Race"),
+        (has_keywords(RACE_DISTANCE_PATTERN) & is_fast, "Race"),
+        (is_race_distance_column(df["distance"]) & is_fast, "Race"),
+        (distance_percentile >= LONG_RUN_PERCENTILE, "Long Run"),
+        (has_keywords(LONG_RUN_PATTERN), "Long Run"),
+    ]
+    conditions = [condition for condition, _ in rules]
+    choices = [np.broadcast_to(np.asarray(choice, dtype=object), tag.shape) for _, choice in rules]
+    return pd.Series(np.select(conditions, choices, default="None"), index=df.index, dtype="str")
+
+@instrumented()
+def categorize_activities(df: pd.DataFrame, lean: bool = False) -> pd.DataFrame: 
     # Map Strava default integer workout types to strings
     df["workout_type"] = df["workout_type"].map(workout_type).fillna("None")
                                              
@@ -69,15 +120,23 @@ def categorize_activities(df: pd.DataFrame) -> pd.DataFrame:
 
     # Calculate percentiles only for non-warmup/cooldown runs                          
     clean_mask = ~df["is_warmup_cooldown"]                                             
+    pace_percentile = df.loc[clean_mask, "mile_pace"].rank(pct=True, ascending=False)
+    distance_percentile = df.loc[clean_mask, "distance"].rank(pct=True)
+
+    if lean:
+        # Nullable float32 percentiles, <NA> (blank) for warmups and cooldowns
+        df["pace_percentile"] = pace_percentile.reindex(df.index).astype("Float32")
+        df["distance_percentile"] = distance_percentile.reindex(df.index).astype("Float32")
+    else:
+        # Initialize percentile columns as NaN (blank)                                     
+        df["pace_percentile"] = pd.NA                                                      
+        df["distance_percentile"] = pd.NA                                                  
                                                                                         
-    # Initialize percentile columns as NaN (blank)                                     
-    df["pace_percentile"] = pd.NA                                                      
-    df["distance_percentile"] = pd.NA                                                  
-                                                                                        
-    # Calculate percentiles only for clean runs (rank among themselves)                                                                      
-    df.loc[clean_mask, "pace_percentile"] = df.loc[clean_mask, "mile_pace"].rank(pct=True, ascending=False)                                           
-    df.loc[clean_mask, "distance_percentile"] = df.loc[clean_mask, "distance"].rank(pct=True)   
+        # Calculate percentiles only for clean runs (rank among themselves)                                                                      
+        df.loc[clean_mask, "pace_percentile"] = pace_percentile
+        df.loc[clean_mask, "distance_percentile"] = distance_percentile
 
     # Classfiy the remaining runs
-    df["workout_type"] = df.apply(classify_run, axis=1)
+    labels = classify_runs(df)
+    df["workout_type"] = pd.Categorical(labels, categories=WORKOUT_LABELS) if lean else labels
     return df
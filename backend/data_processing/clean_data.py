@@ -1,23 +1,28 @@
 import pandas as pd
-from .calculate_vdot import calculate_vdot
+from instrumentation import instrumented
+from .calculate_vdot import calculate_vdot_column
 
 DESIRED_COLUMNS = ["name", "type", "distance", "elapsed_time", "moving_time", "average_heartrate", "total_elevation_gain", "workout_type", "start_date_local"]
 METERS_PER_MILE = 1609.34
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame: 
-    # Toss out undesired data
-    df = df[DESIRED_COLUMNS]
+# Lean mode: float32 where 7 significant digits are plenty (miles, minutes, HR, meters, VDOT),
+# repeated strings as categoricals and the raw Strava workout_type code as a nullable int8
+LEAN_FLOAT_COLUMNS = ["distance", "elapsed_time", "moving_time", "average_heartrate", "total_elevation_gain", "mile_pace", "vdot"]
+LEAN_CATEGORY_COLUMNS = ["name", "type"]
 
-    # Filter only runs
-    df = df.loc[df["type"] == "Run"]
+@instrumented()
+def clean_data(df: pd.DataFrame, lean: bool = False) -> pd.DataFrame: 
+    # Filter only runs and toss out undesired data in one selection, so the frame below is
+    # a single copy and every assignment replaces a column instead of writing into a slice
+    df = df.loc[df["type"] == "Run", DESIRED_COLUMNS]
 
     # Convert to minutes and miles
-    df.moving_time /= 60
-    df.elapsed_time /= 60
-    df.distance /= METERS_PER_MILE
+    df["moving_time"] = df["moving_time"] / 60
+    df["elapsed_time"] = df["elapsed_time"] / 60
+    df["distance"] = df["distance"] / METERS_PER_MILE
 
     # Add a column for pace in minutes / mile
-    df["mile_pace"] = df.moving_time / df.distance
+    df["mile_pace"] = df["moving_time"] / df["distance"]
 
     # Convert ISO8601 to Datetime
     df["start_date_local"] = pd.to_datetime(df["start_date_local"]).dt.tz_localize(None)
@@ -25,7 +30,18 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     # Group runs by week (first day of the week)
     df["week_start"] = df["start_date_local"].dt.to_period("W-SUN").dt.start_time          
     
-    # Calculate the vdot for each run
-    df["vdot"] = df.apply(calculate_vdot, axis=1)
+    # Calculate the vdot for each run (at full precision, before any downcast)
+    df["vdot"] = calculate_vdot_column(df)
 
-    return df
+    return compact_activities(df) if lean else df
+
+def compact_activities(df: pd.DataFrame) -> pd.DataFrame:
+    columns = {column: df[column].astype("float32") for column in LEAN_FLOAT_COLUMNS if column in df}
+    columns |= {column: df[column].astype("category") for column in LEAN_CATEGORY_COLUMNS if column in df}
+    if "workout_type" in df and pd.api.types.is_numeric_dtype(df["workout_type"]):
+        columns["workout_type"] = df["workout_type"].astype("Int8")
+    return df.assign(**columns)
+
+# Deep (strings included) bytes per row, the figure that decides how many athletes fit in a worker
+def memory_per_activity(df: pd.DataFrame) -> float:
+    return float(df.memory_usage(index=True, deep=True).sum() / len(df)) if len(df) else 0.0
@@ -0,0 +1,78 @@
+import json
+import re
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Iterable, Iterator
+from .clean_data import DESIRED_COLUMNS
+
+# Streaming ingestion: activities are decoded one at a time, non-runs are dropped on the spot and
+# runs are reduced to the needed fields, so rides, swims and nested map / athlete objects are
+# never held together and the DataFrame is built once from column arrays.
+CHUNK_SIZE = 1 << 20
+RAW_COLUMNS = ["id"] + DESIRED_COLUMNS
+INTEGER_COLUMNS = ["id"]
+STRING_COLUMNS = ["name", "type", "start_date_local"]
+SEPARATORS = re.compile(r"[\s,]*")
+
+# Records of a top-level JSON array, read chunk by chunk
+def iter_json_array(path: str | Path, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as f:
+        buffer, position, eof, started = "", 0, False, False
+        while True:
+            position = SEPARATORS.match(buffer, position).end()
+            if position == len(buffer):
+                if eof: raise ValueError(f"Unexpected end of JSON array in {path}")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+
+            if not started:
+                if buffer[position] != "[": raise ValueError(f"Expected a JSON array in {path}")
+                started = True
+                position += 1
+                continue
+            if buffer[position] == "]": return
+
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # The record runs past the end of the buffer, read more (malformed if there is none)
+                if eof: raise ValueError(f"Malformed JSON in {path}")
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer, position = buffer[position:] + chunk, 0
+                continue
+            position = end
+            yield record
+
+# Pages from fetch_activity_pages (or any iterable of activity lists) as one record stream
+def iter_pages(pages: Iterable[list[dict]]) -> Iterator[dict]:
+    for page in pages:
+        yield from page
+
+def iter_runs(records: Iterable[dict], columns: list[str] = RAW_COLUMNS) -> Iterator[tuple]:
+    for record in records:
+        if record.get("type") == "Run":
+            yield tuple(record.get(column) for column in columns)
+
+# Column arrays -> DataFrame in one step, with the dtypes pandas.read_json gives these fields
+def runs_frame(records: Iterable[dict], columns: list[str] = RAW_COLUMNS) -> pd.DataFrame:
+    rows = list(iter_runs(records, columns))
+    values = list(zip(*rows)) if rows else [()] * len(columns)
+
+    data = {}
+    for column, column_values in zip(columns, values):
+        if column in STRING_COLUMNS:
+            data[column] = pd.array(column_values, dtype="str")
+        elif column in INTEGER_COLUMNS:
+            data[column] = np.array(column_values, dtype="int64")
+        else:
+            # None (missing heart rate, untagged workout_type) becomes NaN
+            data[column] = np.array(column_values, dtype="float64")
+    return pd.DataFrame(data, copy=False)
+
+def load_runs(data_file: str | Path, chunk_size: int = CHUNK_SIZE) -> pd.DataFrame:
+    return runs_frame(iter_json_array(data_file, chunk_size))
@@ -1,18 +1,39 @@
 import pandas as pd
-from .categorize_activities import categorize_activities
-from .clean_data import clean_data
+from .activity_store import store_dir_for, is_store_current, load_store, write_store, clean_records
+from .ingest import load_runs
 from pathlib import Path                                                               
+from instrumentation import instrumented
                                                                                          
 DATA_URL = Path(__file__).parent.parent / "data" / "raw_activities.json"   
 
-def load_data() -> pd.DataFrame:
+# Runs only, streamed from the raw JSON (see ingest.py), ready for clean_records
+@instrumented()
+def load_data(data_file: Path = DATA_URL) -> pd.DataFrame:
     try:
-        df = pd.read_json(DATA_URL, orient="records")
+        df = load_runs(data_file)
         return df
     except ValueError:
         print("Error: JSON file is malformed or empty.")
         return None
 
+# Cleaned activities from the columnar store, rebuilt from the raw JSON only when the store is stale
+@instrumented()
+def load_activities(data_file: Path = DATA_URL) -> pd.DataFrame:
+    store_dir = store_dir_for(data_file)
+    if is_store_current(store_dir, data_file):
+        return load_store(store_dir)
+
+    try:
+        df = load_runs(data_file)
+    except ValueError:
+        print("Error: JSON file is malformed or empty.")
+        return None
+
+    df = clean_records(df)
+    write_store(df, store_dir, source_file=data_file)
+    return df
+
+@instrumented()
 def aggregate_weekly(df: pd.DataFrame) -> pd.DataFrame:
     weekly = df.groupby("week_start").agg(                                             
         total_miles=("distance", "sum"),
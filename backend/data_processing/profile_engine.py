@@ -0,0 +1,132 @@
+import math
+import pandas as pd
+from datetime import datetime, timedelta
+from models import RunnerProfile, WeeklySummary
+from instrumentation import instrumented
+from .calculate_race_performances import calculate_race_performances
+from .processor import aggregate_weekly
+from .training_load import DAY_FIELDS, daily_training, run_intensity_hours, training_load, training_load_summary
+
+WEEK_FIELDS = ["total_miles", "num_runs", "total_time", "vdot_max", "total_elevation"]
+
+def safe_divide(numerator: float, denominator: float) -> float:
+    # Mirrors pandas division semantics for empty weeks instead of raising
+    if denominator == 0:
+        return math.nan if numerator == 0 else math.inf
+    return numerator / denominator
+
+def zero_if_missing(value) -> float:
+    return 0.0 if pd.isna(value) else value
+
+# Keeps per-week running aggregates plus the mileage sums the CV needs, so adding an activity
+# only touches its own week and the profile statistics are O(1) to read.
+class IncrementalProfile:
+    def __init__(self):
+        self.weeks: dict[pd.Timestamp, dict] = {}
+        # Per-day sums the training load series is rebuilt from (see training_load.daily_training)
+        self.days: dict[pd.Timestamp, dict] = {}
+        self.activity_ids: set[int] = set()
+        self.mileage_sum = 0.0
+        self.mileage_sum_squares = 0.0
+
+    @classmethod
+    @instrumented("IncrementalProfile.from_activities")
+    def from_activities(cls, df: pd.DataFrame) -> "IncrementalProfile":
+        profile = cls()
+        if "id" in df.columns:
+            profile.activity_ids.update(df["id"].tolist())
+
+        # Seed from the vectorized weekly aggregation rather than replaying every activity
+        weekly_df = aggregate_weekly(df)
+        for week in weekly_df[["week_start"] + WEEK_FIELDS].to_dict("records"):
+            week_start = week.pop("week_start")
+            if pd.isna(week["vdot_max"]): week["vdot_max"] = None
+            profile.weeks[week_start] = week
+            profile.mileage_sum += week["total_miles"]
+            profile.mileage_sum_squares += week["total_miles"] ** 2
+        profile.days = daily_training(df).to_dict("index")
+        return profile
+
+    def add_activity(self, activity: dict) -> bool:
+        activity_id = activity.get("id")
+        if activity_id is not None:
+            if activity_id in self.activity_ids: return False
+            self.activity_ids.add(activity_id)
+
+        week = self.weeks.get(activity["week_start"])
+        if week is None:
+            week = {"total_miles": 0.0, "num_runs": 0, "total_time": 0.0, "vdot_max": None, "total_elevation": 0.0}
+            self.weeks[activity["week_start"]] = week
+        else:
+            # Take the week's old mileage out of the running sums before updating it
+            self.mileage_sum -= week["total_miles"]
+            self.mileage_sum_squares -= week["total_miles"] ** 2
+
+        # Missing values count as 0 like the pandas sums of a full rebuild (and count() skips them)
+        distance, moving_time = activity["distance"], activity["moving_time"]
+        week["total_miles"] += zero_if_missing(distance)
+        week["num_runs"] += 0 if pd.isna(distance) else 1
+        week["total_time"] += zero_if_missing(moving_time)
+        week["total_elevation"] += zero_if_missing(activity["total_elevation_gain"])
+        vdot = activity.get("vdot")
+        if vdot is not None and not pd.isna(vdot):
+            week["vdot_max"] = vdot if week["vdot_max"] is None else max(week["vdot_max"], vdot)
+
+        self.mileage_sum += week["total_miles"]
+        self.mileage_sum_squares += week["total_miles"] ** 2
+
+        day = self.days.setdefault(activity["start_date_local"].normalize(), {field: 0.0 for field in DAY_FIELDS} | {"vdot_max": math.nan})
+        day["hours"] += zero_if_missing(moving_time) / 60
+        day["intensity_hours"] += float(run_intensity_hours(moving_time, activity["mile_pace"]))
+        if vdot is not None and not pd.isna(vdot) and not vdot <= day["vdot_max"]:
+            day["vdot_max"] = vdot
+        return True
+
+    # Add cleaned activities (clean_data output), returns how many were new
+    def add_activities(self, df: pd.DataFrame) -> int:
+        return sum(self.add_activity(activity) for activity in df.to_dict("records"))
+
+    @property
+    def avg_weekly_mileage(self) -> float:
+        return safe_divide(self.mileage_sum, len(self.weeks))
+
+    @property
+    def coefficient_of_variance(self) -> float:
+        # Sample standard deviation (ddof=1) over weeks, like Series.std()
+        num_weeks = len(self.weeks)
+        if num_weeks < 2: return math.nan
+        variance = (self.mileage_sum_squares - self.mileage_sum ** 2 / num_weeks) / (num_weeks - 1)
+        return safe_divide(math.sqrt(max(variance, 0.0)), self.avg_weekly_mileage)
+
+    def recent_weeks(self, number_of_weeks: int, now: datetime | None = None) -> list[WeeklySummary]:
+        cutoff_date = (now or datetime.now()) - timedelta(weeks=number_of_weeks)
+        return [
+            WeeklySummary(
+                week_start=week_start,
+                avg_pace=safe_divide(week["total_time"], week["total_miles"]),
+                **week
+            )
+            for week_start, week in sorted(self.weeks.items())
+            if week_start >= cutoff_date
+        ]
+
+    # Daily load, fitness, fatigue and form over the whole history, carried forward to `now`
+    def training_load(self, now: datetime | None = None) -> pd.DataFrame:
+        # Column lists, DataFrame.from_dict(orient="index") is ~20x slower on a multi-year history
+        values = list(self.days.values())
+        days = pd.DataFrame({field: [day[field] for day in values] for field in DAY_FIELDS},
+                            index=pd.DatetimeIndex(list(self.days), name="date"), dtype="float64").sort_index()
+        return training_load(days, now or datetime.now())
+
+    def to_profile(self, number_of_recent_weeks: int, now: datetime | None = None) -> RunnerProfile:
+        recent_weeks = self.recent_weeks(number_of_recent_weeks, now)
+        cv = self.coefficient_of_variance
+        current_load, load_history = training_load_summary(self.training_load(now))
+        return RunnerProfile(
+            recent_weeks=recent_weeks,
+            avg_weekly_mileage=self.avg_weekly_mileage,
+            coefficient_of_variance=cv,
+            predicted_race_times=calculate_race_performances(recent_weeks, cv),
+            training_load=current_load,
+            training_load_history=load_history
+        )
@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from models import TrainingLoad
+from instrumentation import instrumented
+from .calculate_vdot import METERS_PER_MILE
+
+# Fitness / fatigue time constants (days) of the impulse-response model behind CTL / ATL / TSB
+FITNESS_DAYS = 42
+FATIGUE_DAYS = 7
+RAMP_DAYS = 7
+# Threshold pace comes from the best VDOT of the trailing window (Daniels: threshold ~88% of VO2max)
+VDOT_WINDOW_DAYS = 90
+THRESHOLD_VO2_FRACTION = 0.88
+# Intensity factor assumed for every run until the athlete has a VDOT
+DEFAULT_INTENSITY = 0.75
+TSS_PER_HOUR_AT_THRESHOLD = 100
+
+DAY_FIELDS = ["hours", "intensity_hours", "vdot_max"]
+
+# Hours / pace^2 per run. A run's load is hours * (threshold pace / pace)^2 * 100, and every run on a
+# day shares the day's threshold, so per-day sums of this term are enough to price the whole day.
+def run_intensity_hours(moving_time, mile_pace):
+    hours = np.asarray(moving_time, dtype="float64") / 60
+    pace = np.asarray(mile_pace, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        intensity_hours = hours / pace ** 2
+    return np.where(np.isfinite(intensity_hours) & (pace > 0), intensity_hours, 0.0)
+
+# Cleaned activities -> one row per day with runs: DAY_FIELDS summed (vdot maxed)
+@instrumented()
+def daily_training(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty: return pd.DataFrame(columns=DAY_FIELDS, index=pd.DatetimeIndex([], name="date"), dtype="float64")
+    runs = pd.DataFrame({
+        "date": df["start_date_local"].dt.normalize(),
+        "hours": df["moving_time"].to_numpy(dtype="float64") / 60,
+        "intensity_hours": run_intensity_hours(df["moving_time"], df["mile_pace"]),
+        "vdot_max": df["vdot"].to_numpy(dtype="float64"),
+    })
+    return runs.groupby("date").agg(hours=("hours", "sum"), intensity_hours=("intensity_hours", "sum"), vdot_max=("vdot_max", "max"))
+
+# Inverse of calculate_vo2_cost: VO2 (ml/kg/min) -> velocity (m/min), the positive quadratic root
+def velocity_at_vo2(vo2):
+    a, b, c = 0.000104, 0.182258, -4.60 - vo2
+    return (-b + np.sqrt(b * b - 4 * a * c)) / (2 * a)
+
+def threshold_pace(vdot):
+    return METERS_PER_MILE / velocity_at_vo2(THRESHOLD_VO2_FRACTION * vdot)
+
+# Daily series over the full history: load, fitness (CTL), fatigue (ATL), form (TSB), rolling best
+# VDOT and ramp rate. Starts the day before the first run (everything 0) and runs to `end` if later.
+@instrumented()
+def training_load(days: pd.DataFrame, end: datetime | None = None) -> pd.DataFrame:
+    if days.empty: return pd.DataFrame(columns=["load", "fitness", "fatigue", "form", "best_vdot", "ramp_rate"], dtype="float64")
+    last = days.index.max() if end is None else max(days.index.max(), pd.Timestamp(end).normalize())
+    index = pd.date_range(days.index.min() - pd.Timedelta(days=1), last, freq="D", name="date")
+    days = days.reindex(index)
+
+    best_vdot = days["vdot_max"].rolling(VDOT_WINDOW_DAYS, min_periods=1).max()
+    # Keep the last known threshold through a long gap, before the first VDOT fall back to a fixed intensity
+    threshold = threshold_pace(best_vdot.ffill())
+    hours = days["hours"].fillna(0.0)
+    load = TSS_PER_HOUR_AT_THRESHOLD * (threshold ** 2 * days["intensity_hours"].fillna(0.0)).where(
+        threshold.notna(), DEFAULT_INTENSITY ** 2 * hours)
+
+    fitness = load.ewm(alpha=1 / FITNESS_DAYS, adjust=False).mean()
+    fatigue = load.ewm(alpha=1 / FATIGUE_DAYS, adjust=False).mean()
+    return pd.DataFrame({
+        "load": load,
+        "fitness": fitness,
+        "fatigue": fatigue,
+        # Form going into the day: yesterday's fitness minus yesterday's fatigue
+        "form": (fitness - fatigue).shift(1, fill_value=0.0),
+        "best_vdot": best_vdot,
+        "ramp_rate": fitness.diff(RAMP_DAYS).fillna(fitness),
+    })
+
+def to_training_load(date: pd.Timestamp, row: dict) -> TrainingLoad:
+    best_vdot = row["best_vdot"]
+    return TrainingLoad(date=date, load=row["load"], fitness=row["fitness"], fatigue=row["fatigue"], form=row["form"],
+                        ramp_rate=row["ramp_rate"], best_vdot=None if pd.isna(best_vdot) else best_vdot)
+
+# The latest day plus one point per week (each week's last day) for trend charts
+def training_load_summary(series: pd.DataFrame) -> tuple[TrainingLoad | None, list[TrainingLoad]]:
+    if series.empty: return None, []
+    weekly = series.groupby(series.index.to_period("W-SUN")).tail(1)
+    history = [to_training_load(date, row) for date, row in zip(weekly.index, weekly.to_dict("records"))]
+    return to_training_load(series.index[-1], series.iloc[-1].to_dict()), history
@@ -0,0 +1,8 @@
+import functools
+
+# .env is read on first use instead of at import time, so importing a module that only
+# needs an API key later (or never) does not pay for python-dotenv and a filesystem walk
+@functools.cache
+def load_env() -> None:
+    from dotenv import load_dotenv
+    load_dotenv()
@@ -1,42 +1,235 @@
 import os
 import requests
 import json
-import time
-from dotenv import load_dotenv
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from instrumentation import observe_response
+from models import Athlete, SyncResult
+from rate_limit import StravaRateLimiter
+from storage import atomic_write_json
+from token_manager import TokenManager
+from env import load_env
 
-load_dotenv()
-
-CLIENT_ID = os.getenv("STRAVA_CLIENT_ID")
-CLIENT_SECRET = os.getenv("STRAVA_CLIENT_SECRET")
 TOKEN_FILE = "strava_tokens.json"
 DATA_FILE = "data/raw_activities.json"
+SYNC_STATE_FILE = "data/sync_state.json"
+ATHLETES_DIR = "data/athletes"
+# Overridable so the fetcher can be pointed at a local stub server
+STRAVA_API_URL = os.getenv("STRAVA_API_URL", "https://www.strava.com/api/v3")
+ACTIVITIES_URL = f"{STRAVA_API_URL}/athlete/activities"
 NUM_ACTIVITIES = 200
+PER_PAGE = 200  # Strava's maximum page size
+MAX_RETRIES = 5
+MAX_WORKERS = 8
+
+# Client id / secret are read from the environment (.env included) when a token is refreshed
+TOKEN_MANAGER = TokenManager()
+
+def get_valid_access_tokens(token_file: str = TOKEN_FILE, athlete_id: str | None = None):
+    # Tokens are cached in memory per athlete, so the file is only read once per process
+    return TOKEN_MANAGER.get_access_token(athlete_id or token_file, token_file)
+
+def create_session(access_token: str) -> requests.Session:
+    # One keep-alive session per sync so every page reuses the same pooled connection
+    session = requests.Session()
+    session.headers.update({"Authorization": f"Bearer {access_token}"})
+    return session
+
+def start_timestamp(activity: dict) -> int:
+    # Strava start_date is UTC ISO8601 ("2024-05-04T12:00:00Z"), which is what `after` filters on
+    return int(datetime.fromisoformat(activity["start_date"]).timestamp())
+
+def file_size(path: str) -> int | None:
+    return os.path.getsize(path) if os.path.exists(path) else None
+
+# Sync cursor: the newest start timestamp plus the ids that start exactly at it. Strava only returns
+# activities at or after `after`, so older ids never need checking and the state stays O(1) in size.
+def cursor_state(activities: list[dict], after: int = 0, ids: set | None = None) -> dict:
+    state = {"after": after, "ids": set(ids or ())}
+    for activity in activities:
+        timestamp = start_timestamp(activity)
+        if timestamp > state["after"]:
+            state = {"after": timestamp, "ids": set()}
+        if timestamp == state["after"]:
+            state["ids"].add(activity["id"])
+    return state
+
+def load_sync_state(data_file: str = DATA_FILE, state_file: str = SYNC_STATE_FILE) -> dict:
+    # Fast path: the sidecar is valid while the activity file is still the size it recorded
+    if os.path.exists(state_file):
+        with open(state_file, "r") as f:
+            state = json.load(f)
+        if state.get("data_size") is not None and state["data_size"] == file_size(data_file):
+            return {"after": state["after"], "ids": set(state["ids"])}
+
+    # No sidecar yet (e.g. data from a full fetch), an old format one, or the process died between
+    # appending activities and saving the state: rebuild the cursor from the activity file once
+    if os.path.exists(data_file):
+        with open(data_file, "r") as f:
+            return cursor_state(json.load(f))
+
+    return {"after": 0, "ids": set()}
+
+# Written right after the append, recording the activity file size it belongs to
+def save_sync_state(state: dict, state_file: str = SYNC_STATE_FILE, data_file: str = DATA_FILE) -> None:
+    atomic_write_json(state_file, {"after": state["after"], "ids": sorted(state["ids"]), "data_size": file_size(data_file)})
+
+def rate_limited_get(
+        session: requests.Session,
+        url: str,
+        params: dict,
+        rate_limiter: StravaRateLimiter,
+        max_retries: int = MAX_RETRIES
+        ) -> requests.Response:
+    for _ in range(max_retries + 1):
+        rate_limiter.acquire()
+        response = session.get(url, params=params)
+        observe_response("strava.activities", response)
+        rate_limiter.update(response.headers)
+
+        if response.status_code != 429: break
+        # Wait out the exhausted window instead of failing the sync
+        delay = rate_limiter.backoff(response)
+        print(f"Rate limited, backing off for {delay:.0f}s...")
+
+    response.raise_for_status()
+    return response
+
+def fetch_activity_pages(
+        session: requests.Session,
+        after: int,
+        per_page: int = PER_PAGE,
+        rate_limiter: StravaRateLimiter | None = None,
+        activities_url: str = ACTIVITIES_URL
+        ):
+    if rate_limiter is None:
+        rate_limiter = StravaRateLimiter()
 
-def get_valid_access_tokens():
-
-    with open(TOKEN_FILE, mode="r") as f:
-        tokens = json.load(f)
-
-    if tokens["expires_at"] < time.time():
-        print("Refreshing expired token...")
-        response = requests.post(
-            "https://www.strava.com/oauth/token", 
-            data={
-                "client_id": CLIENT_ID,
-                "client_secret": CLIENT_SECRET,
-                "grant_type": "refresh_token",
-                "refresh_token": tokens["refresh_token"]
-            }
+    # With `after` set Strava returns activities oldest first, so paging stops at the first short page
+    page = 1
+    while True:
+        params = {"after": after, "page": page, "per_page": per_page}
+        activities = rate_limited_get(session, activities_url, params, rate_limiter).json()
+
+        if not activities: return
+        yield activities
+        if len(activities) < per_page: return
+        page += 1
+
+def append_activities(activities: list[dict], data_file: str = DATA_FILE) -> None:
+    if not activities: return
+    encoded = ",\n".join(json.dumps(activity) for activity in activities).encode()
+
+    if not os.path.exists(data_file) or os.path.getsize(data_file) == 0:
+        os.makedirs(os.path.dirname(data_file) or ".", exist_ok=True)
+        with open(data_file, "wb") as f:
+            f.write(b"[\n" + encoded + b"\n]")
+        return
+
+    # Splice the new records in before the closing bracket so stored records are never re-serialized
+    with open(data_file, "rb+") as f:
+        position = f.seek(0, os.SEEK_END)
+        is_empty_array = False
+        while position > 0:
+            position -= 1
+            f.seek(position)
+            if f.read(1) == b"]": break
+
+        # Find the last meaningful character before the bracket to decide whether a comma is needed
+        previous = position
+        while previous > 0:
+            previous -= 1
+            f.seek(previous)
+            char = f.read(1)
+            if not char.isspace():
+                is_empty_array = char == b"["
+                break
+
+        f.seek(position)
+        f.truncate()
+        f.write((b"\n" if is_empty_array else b",\n") + encoded + b"\n]")
+
+def sync_activities(
+        access_token: str | None = None,
+        data_file: str = DATA_FILE,
+        state_file: str = SYNC_STATE_FILE,
+        session: requests.Session | None = None,
+        rate_limiter: StravaRateLimiter | None = None,
+        activities_url: str = ACTIVITIES_URL
+        ) -> list[dict]:
+    if access_token is None and session is None:
+        access_token = get_valid_access_tokens()
+    if session is None:
+        session = create_session(access_token)
+
+    state = load_sync_state(data_file, state_file)
+    print(f"Syncing activities after {state['after']}...")
+
+    new_activities = []
+    seen = set(state["ids"])
+    for page in fetch_activity_pages(session, state["after"], rate_limiter=rate_limiter, activities_url=activities_url):
+        for activity in page:
+            if activity["id"] in seen or start_timestamp(activity) < state["after"]: continue
+            seen.add(activity["id"])
+            new_activities.append(activity)
+
+    append_activities(new_activities, data_file)
+    save_sync_state(cursor_state(new_activities, state["after"], state["ids"]), state_file, data_file)
+    if new_activities:
+        # Keep the columnar store in step so the next profile build does not reparse the JSON (it skips
+        # ids it already holds). Imported here so a sync with nothing new never loads pandas.
+        from data_processing.activity_store import append_to_store, store_dir_for
+        append_to_store(new_activities, store_dir_for(data_file), source_file=data_file)
+
+    print(f"Success! {len(new_activities)} new activities synced to {data_file}.")
+    return new_activities
+
+def discover_athletes(athletes_dir: str = ATHLETES_DIR) -> list[Athlete]:
+    # One directory per athlete: data/athletes/<athlete_id>/{strava_tokens,raw_activities,sync_state}.json
+    if not os.path.isdir(athletes_dir): return []
+    return [
+        Athlete(
+            athlete_id=athlete_id,
+            token_file=os.path.join(athletes_dir, athlete_id, "strava_tokens.json"),
+            data_file=os.path.join(athletes_dir, athlete_id, "raw_activities.json"),
+            state_file=os.path.join(athletes_dir, athlete_id, "sync_state.json")
         )
+        for athlete_id in sorted(os.listdir(athletes_dir))
+        if os.path.isdir(os.path.join(athletes_dir, athlete_id))
+    ]
 
-        new_tokens = response.json()
+def sync_athlete(athlete: Athlete, rate_limiter: StravaRateLimiter, activities_url: str = ACTIVITIES_URL) -> SyncResult:
+    try:
+        access_token = get_valid_access_tokens(athlete.token_file, athlete.athlete_id)
+        with create_session(access_token) as session:
+            new_activities = sync_activities(
+                data_file=athlete.data_file,
+                state_file=athlete.state_file,
+                session=session,
+                rate_limiter=rate_limiter,
+                activities_url=activities_url
+            )
+        return SyncResult(athlete_id=athlete.athlete_id, new_activities=len(new_activities))
+    except Exception as e:
+        # One athlete's failure (revoked token, bad file) must not abort the batch
+        return SyncResult(athlete_id=athlete.athlete_id, error=f"{type(e).__name__}: {e}")
 
-        with open("strava_tokens.json", "w") as f:
-            json.dump(new_tokens, f)
+def sync_athletes(
+        athletes: list[Athlete],
+        max_workers: int = MAX_WORKERS,
+        rate_limiter: StravaRateLimiter | None = None,
+        activities_url: str = ACTIVITIES_URL
+        ) -> list[SyncResult]:
+    # Every worker shares one limiter since Strava's quotas are per application, not per athlete
+    if rate_limiter is None:
+        rate_limiter = StravaRateLimiter()
 
-        return new_tokens["access_token"]
-    
-    return tokens["access_token"]
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(sync_athlete, athlete, rate_limiter, activities_url) for athlete in athletes]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return results
 
 def fetch_activities():
     access_token = get_valid_access_tokens()
@@ -45,22 +238,27 @@ def fetch_activities():
 
     print("Fetching activities...")
 
-    url = f"https://www.strava.com/api/v3/athlete/activities?per_page={NUM_ACTIVITIES}"
+    url = f"{ACTIVITIES_URL}?per_page={NUM_ACTIVITIES}"
     headers = {"Authorization": f"Bearer {access_token}"}
 
     response = requests.get(url, headers=headers)
+    observe_response("strava.activities", response)
 
     if response.status_code == 200:
         activities = response.json()
-        
+
         os.makedirs("data", exist_ok=True)
 
         with open(DATA_FILE, "w") as f:
-            json.dump(activities, f, indent=4)
-        
+            json.dump(activities, f)
+
+        # Seed the incremental sync cursor from the full download
+        save_sync_state(cursor_state(activities))
+
         print(f"Success! {len(activities)} Activities save to {DATA_FILE}.")
     else:
         print("Error, failed to access activities: ", response.json())
 
 if __name__ == "__main__":
-    fetch_activities()
\ No newline at end of file
+    load_env()
+    sync_activities()
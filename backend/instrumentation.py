@@ -0,0 +1,192 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from storage import atomic_write_bytes
+
+# Opt-in: RACE_COACH_INSTRUMENT=1 or enable(). While disabled every hook is a single flag check.
+# numpy / pandas are imported on first use: every HTTP client imports this module, most never need them.
+ENABLED = os.getenv("RACE_COACH_INSTRUMENT", "") not in ("", "0")
+MAX_SAMPLES = 10_000    # Per stage, enough for a stable p99 without unbounded growth
+QUANTILES = (0.5, 0.9, 0.99)
+METRIC_PREFIX = "race_coach"
+
+class Metric:
+    def __init__(self):
+        self.durations = deque(maxlen=MAX_SAMPLES)
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.bytes = 0
+        self.memory_bytes = 0
+
+    def quantiles(self) -> dict[float, float]:
+        if not self.durations: return {q: float("nan") for q in QUANTILES}
+        import numpy as np
+        return dict(zip(QUANTILES, np.quantile(np.fromiter(self.durations, dtype="float64"), QUANTILES).tolist()))
+
+class Recorder:
+    def __init__(self):
+        self.metrics: dict[tuple[str, str], Metric] = {}
+        self.lock = threading.Lock()
+        self.jsonl_path: Path | None = None
+
+    def record(self, kind: str, name: str, seconds: float, error: bool = False, rows_in: int | None = None,
+               rows_out: int | None = None, memory_bytes: int | None = None, size_bytes: int | None = None,
+               status: int | None = None) -> None:
+        with self.lock:
+            metric = self.metrics.get((kind, name))
+            if metric is None:
+                metric = self.metrics[(kind, name)] = Metric()
+            metric.durations.append(seconds)
+            metric.count += 1
+            metric.errors += error
+            metric.total_seconds += seconds
+            if rows_in is not None: metric.rows_in += rows_in
+            if rows_out is not None: metric.rows_out += rows_out
+            if size_bytes is not None: metric.bytes += size_bytes
+            if memory_bytes is not None: metric.memory_bytes = memory_bytes
+
+            if self.jsonl_path is not None:
+                event = {"ts": time.time(), "kind": kind, "name": name, "seconds": seconds, "error": error,
+                         "rows_in": rows_in, "rows_out": rows_out, "memory_bytes": memory_bytes, "bytes": size_bytes, "status": status}
+                with open(self.jsonl_path, "a") as f:
+                    f.write(json.dumps({key: value for key, value in event.items() if value is not None}) + "\n")
+
+    def clear(self) -> None:
+        with self.lock:
+            self.metrics.clear()
+
+RECORDER = Recorder()
+
+def enable(jsonl_path: str | Path | None = None) -> None:
+    global ENABLED
+    ENABLED = True
+    RECORDER.jsonl_path = Path(jsonl_path) if jsonl_path is not None else None
+
+def disable() -> None:
+    global ENABLED
+    ENABLED = False
+
+def frame_rows(value) -> int | None:
+    import pandas as pd
+    return len(value) if isinstance(value, (pd.DataFrame, pd.Series)) else None
+
+def frame_memory(value) -> int | None:
+    import pandas as pd
+    # Shallow usage: deep=True would walk every string and cost more than most stages
+    if isinstance(value, pd.DataFrame): return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series): return int(value.memory_usage(index=True, deep=False))
+    return None
+
+# Context manager for a block: set rows_in / rows_out / memory_bytes on it as they become known
+class Span:
+    def __init__(self, name: str, kind: str = "stage", rows_in: int | None = None):
+        self.name = name
+        self.kind = kind
+        self.rows_in = rows_in
+        self.rows_out = None
+        self.memory_bytes = None
+        self.start = 0.0
+
+    def set_output(self, value) -> None:
+        self.rows_out = frame_rows(value)
+        self.memory_bytes = frame_memory(value)
+
+    def __enter__(self) -> "Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if ENABLED:
+            RECORDER.record(self.kind, self.name, time.perf_counter() - self.start, error=exc_type is not None,
+                            rows_in=self.rows_in, rows_out=self.rows_out, memory_bytes=self.memory_bytes)
+
+def stage(name: str, rows_in: int | None = None) -> Span:
+    return Span(name, "stage", rows_in)
+
+# Decorator for a pipeline stage: DataFrame arguments / results give rows in, rows out and memory
+def instrumented(name: str | None = None):
+    def decorator(function):
+        stage_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not ENABLED:
+                return function(*args, **kwargs)
+            rows_in = next((rows for rows in map(frame_rows, args) if rows is not None), None)
+            start = time.perf_counter()
+            try:
+                result = function(*args, **kwargs)
+            except Exception:
+                RECORDER.record("stage", stage_name, time.perf_counter() - start, error=True, rows_in=rows_in)
+                raise
+            RECORDER.record("stage", stage_name, time.perf_counter() - start, rows_in=rows_in,
+                            rows_out=frame_rows(result), memory_bytes=frame_memory(result))
+            return result
+        return wrapper
+    return decorator
+
+# HTTP latency and size from a finished requests.Response (elapsed is time to the response headers)
+def observe_response(name: str, response) -> None:
+    if not ENABLED: return
+    length = response.headers.get("Content-Length")
+    size = int(length) if length is not None else len(response.content)
+    RECORDER.record("http", name, response.elapsed.total_seconds(), error=response.status_code >= 400,
+                    size_bytes=size, status=response.status_code)
+
+def summary() -> dict:
+    with RECORDER.lock:
+        return {
+            f"{kind}:{name}": {
+                "count": metric.count,
+                "errors": metric.errors,
+                "total_seconds": metric.total_seconds,
+                **{f"p{int(q * 100)}_seconds": value for q, value in metric.quantiles().items()},
+                "rows_in": metric.rows_in,
+                "rows_out": metric.rows_out,
+                "bytes": metric.bytes,
+                "memory_bytes": metric.memory_bytes,
+            }
+            for (kind, name), metric in sorted(RECORDER.metrics.items())
+        }
+
+def prometheus_text() -> str:
+    families = {
+        "stage": (f"{METRIC_PREFIX}_stage_seconds", "stage"),
+        "http": (f"{METRIC_PREFIX}_http_request_seconds", "endpoint"),
+    }
+    lines = []
+    with RECORDER.lock:
+        for kind, (metric_name, label) in families.items():
+            metrics = sorted((name, metric) for (metric_kind, name), metric in RECORDER.metrics.items() if metric_kind == kind)
+            if not metrics: continue
+            lines.append(f"# TYPE {metric_name} summary")
+            for name, metric in metrics:
+                for q, value in metric.quantiles().items():
+                    lines.append(f'{metric_name}{{{label}="{name}",quantile="{q}"}} {value}')
+                lines.append(f'{metric_name}_sum{{{label}="{name}"}} {metric.total_seconds}')
+                lines.append(f'{metric_name}_count{{{label}="{name}"}} {metric.count}')
+
+            counters = {"errors_total": "errors"}
+            if kind == "stage":
+                counters |= {"rows_in_total": "rows_in", "rows_out_total": "rows_out"}
+            else:
+                counters |= {"response_bytes_total": "bytes"}
+            prefix = metric_name.removesuffix("_seconds")
+            for suffix, attribute in counters.items():
+                lines.append(f"# TYPE {prefix}_{suffix} counter")
+                lines.extend(f'{prefix}_{suffix}{{{label}="{name}"}} {getattr(metric, attribute)}' for name, metric in metrics)
+            if kind == "stage":
+                lines.append(f"# TYPE {prefix}_dataframe_bytes gauge")
+                lines.extend(f'{prefix}_dataframe_bytes{{{label}="{name}"}} {metric.memory_bytes}' for name, metric in metrics)
+    return "\n".join(lines) + "\n"
+
+# For the node exporter textfile collector
+def write_prometheus(path: str | Path) -> None:
+    atomic_write_bytes(path, prometheus_text().encode())
@@ -32,11 +32,22 @@ class RacePrediction(BaseModel):
     ideal_time: float
     consistency_penalty: float
 
+class TrainingLoad(BaseModel):
+    date: datetime
+    load: float = Field(ge=0)
+    fitness: float = Field(ge=0)
+    fatigue: float = Field(ge=0)
+    form: float
+    ramp_rate: float
+    best_vdot: Optional[float] = None
+
 class RunnerProfile(BaseModel):
     recent_weeks: list[WeeklySummary]
     avg_weekly_mileage: float = Field(ge=0)
     coefficient_of_variance: float = Field(ge=0)
     predicted_race_times: Optional[list[RacePrediction]] = []
+    training_load: Optional[TrainingLoad] = None
+    training_load_history: list[TrainingLoad] = []
 
 class WeatherConditions(BaseModel):
     temperature_f: float
@@ -63,3 +74,27 @@ class RaceInfo(BaseModel):
     lat: Optional[float] = None
     lon: Optional[float] = None
     weather: Optional[WeatherConditions] = None
+
+class Athlete(BaseModel):
+    athlete_id: str
+    token_file: str
+    data_file: str
+    state_file: str
+
+class SyncResult(BaseModel):
+    athlete_id: str
+    new_activities: int = Field(default=0, ge=0)
+    error: Optional[str] = None
+
+class ProfileResult(BaseModel):
+    source: str
+    profile: Optional[RunnerProfile] = None
+    error: Optional[str] = None
+
+class CourseProfile(BaseModel):
+    course_hash: str
+    distance_miles: float = Field(ge=0)
+    mile_grades: list[float]
+    elevation_adjustment: list[float]
+    elevation_gain_m: float = Field(default=0, ge=0)
+    elevation_loss_m: float = Field(default=0, ge=0)
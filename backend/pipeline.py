@@ -1,49 +1,111 @@
-import pandas as pd
-from datetime import datetime, timedelta
-from data_processing.processor import load_data, aggregate_weekly
-from data_processing.clean_data import clean_data
+import hashlib
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable
+from cache import LRUCache
+from profile_cache import PROFILE_CACHE_VERSION, PROFILE_DISK, profile_slot
+from storage import source_signature
+from data_processing.processor import load_activities, DATA_URL
 from data_processing.categorize_activities import categorize_activities
-from data_processing.calculate_race_performances import calculate_race_performances
-from models import RunnerProfile, WeeklySummary 
+from data_processing.activity_store import clean_records, store_dir_for, is_store_current, store_fingerprint
+from data_processing.calculate_consistency import SAFE_ZONE_CV, BASE_PENALTY, DISTANCE_MULTIPLIERS
+from data_processing.ingest import iter_pages, runs_frame
+from data_processing.clean_data import compact_activities
+from data_processing.profile_engine import IncrementalProfile
+from models import RunnerProfile, ProfileResult
+from instrumentation import instrumented
 
 NUMBER_OF_RECENT_WEEKS = 12
 
-def build_runner_profile() -> RunnerProfile:
+# Profiles are memoized by a fingerprint of the stored activities plus every parameter that shapes them,
+# in memory and in one disk slot per athlete (see profile_cache.py)
+PROFILE_MEMORY_SIZE = 256
+PROFILE_MEMORY = LRUCache(PROFILE_MEMORY_SIZE)
+
+@instrumented()
+def build_profile_engine(data_file: str | Path = DATA_URL, lean: bool = False) -> IncrementalProfile:
     # Process activities
-    df = load_data()
-    df = clean_data(df)
-    df = categorize_activities(df)
+    df = load_activities(data_file)
+    if df is None:
+        raise ValueError(f"No activities could be loaded from {data_file}")
+    if lean: df = compact_activities(df)
+    df = categorize_activities(df, lean=lean)
 
     # Aggregate into weeks
-    weekly_df = aggregate_weekly(df)
-
-    cutoff_date = datetime.now() - timedelta(weeks=NUMBER_OF_RECENT_WEEKS)                            
-
-    # Convert weekly DataFrame rows to WeeklySummary models                   
-    recent_weeks = [                                                          
-        WeeklySummary(                                                        
-            week_start=row["week_start"],
-            total_miles=row["total_miles"],
-            num_runs=row["num_runs"],
-            total_time=row["total_time"],
-            avg_pace=row["avg_pace"],
-            total_elevation=row["total_elevation"],
-            vdot_max=row["vdot_max"]
-        )
-        for _, row in weekly_df.iterrows()
-        if row["week_start"] >= cutoff_date  
-    ]
-
-    # Calculate consistency
-    cv = weekly_df["total_miles"].std() / weekly_df["total_miles"].mean()
-
-    # Build profile
-    return RunnerProfile(
-        recent_weeks=recent_weeks,
-        avg_weekly_mileage=weekly_df["total_miles"].mean(),
-        coefficient_of_variance=cv,
-        predicted_race_times=calculate_race_performances(recent_weeks, cv)
-    )
+    return IncrementalProfile.from_activities(df)
+
+# Fingerprint of the activities behind data_file, rebuilding the columnar store first if the raw file changed
+def activities_fingerprint(data_file: str | Path) -> dict:
+    store_dir = store_dir_for(data_file)
+    if not is_store_current(store_dir, data_file) and load_activities(data_file) is None:
+        raise ValueError(f"No activities could be loaded from {data_file}")
+    return store_fingerprint(store_dir)
+
+# recent_weeks is relative to today, so the day is part of the key as well
+def profile_cache_key(fingerprint: dict, lean: bool, now: datetime) -> str:
+    key = {
+        "version": PROFILE_CACHE_VERSION,
+        "activities": fingerprint,
+        "recent_weeks": NUMBER_OF_RECENT_WEEKS,
+        "consistency": [SAFE_ZONE_CV, BASE_PENALTY, DISTANCE_MULTIPLIERS],
+        "lean": lean,
+        "date": now.date().isoformat(),
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+@instrumented()
+def build_runner_profile(data_file: str | Path = DATA_URL, lean: bool = False, use_cache: bool = True) -> RunnerProfile:
+    now = datetime.now()
+    if not use_cache:
+        return build_profile_engine(data_file, lean).to_profile(NUMBER_OF_RECENT_WEEKS, now)
+
+    # Taken before the fingerprint: a file changing in between leaves the slot stale, never wrongly current
+    source = source_signature(str(data_file))
+    key = profile_cache_key(activities_fingerprint(data_file), lean, now)
+    cached = PROFILE_MEMORY.get(key)
+    if cached is None:
+        slot = PROFILE_DISK.get(profile_slot(data_file, lean))
+        if slot is not None and slot["key"] == key:
+            cached = slot["profile"]
+            PROFILE_MEMORY.set(key, cached)
+    if cached is not None:
+        return RunnerProfile.model_validate_json(cached)
+
+    profile = build_profile_engine(data_file, lean).to_profile(NUMBER_OF_RECENT_WEEKS, now)
+    # Stored serialized: a hit always hands back a fresh object, and the disk layer needs JSON anyway
+    serialized = profile.model_dump_json()
+    PROFILE_MEMORY.set(key, serialized)
+    # Version, source signature and day let the CLI validate the slot without pandas (see profile_cache.py)
+    PROFILE_DISK.set(profile_slot(data_file, lean), {"key": key, "version": PROFILE_CACHE_VERSION, "source": source,
+                                                     "date": now.date().isoformat(), "profile": serialized})
+    return profile
+
+# Fold raw Strava activity pages into an existing engine without a rebuild. Pages straight from
+# fetch_activity_pages are streamed: each page's non-runs are dropped before the next is requested.
+@instrumented()
+def refresh_runner_profile(engine: IncrementalProfile, pages: Iterable[list[dict]]) -> RunnerProfile:
+    engine.add_activities(clean_records(runs_frame(iter_pages(pages))))
+    return engine.to_profile(NUMBER_OF_RECENT_WEEKS)
+
+def build_profile_result(data_file: str | Path, lean: bool = False) -> ProfileResult:
+    try:
+        return ProfileResult(source=str(data_file), profile=build_runner_profile(data_file, lean))
+    except Exception as e:
+        return ProfileResult(source=str(data_file), error=f"{type(e).__name__}: {e}")
+
+# Build many athletes' profiles across cores, yielding each result as soon as it finishes.
+# lean=True keeps each athlete's frame compact (see clean_data.compact_activities) to pack more per worker.
+def build_runner_profiles(data_files: list[str | Path], max_workers: int | None = None, lean: bool = False):
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(build_profile_result, data_file, lean): data_file for data_file in data_files}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # The worker itself died (e.g. out of memory), still report it per athlete
+                yield ProfileResult(source=str(futures[future]), error=f"{type(e).__name__}: {e}")
 
 if __name__ == "__main__":
-    print(build_runner_profile())
\ No newline at end of file
+    print(build_runner_profile())
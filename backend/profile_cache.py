@@ -0,0 +1,20 @@
+from pathlib import Path
+from cache import DiskCache
+
+# Runner profile disk cache, shared by pipeline.build_runner_profile and the CLI fast path.
+# Standard library only, so `race-coach profile` can answer from it without pandas.
+
+# Bump the version when the profile computation itself changes
+PROFILE_CACHE_VERSION = 3
+# Each athlete has a single slot (keyed by data file) holding its latest profile and key,
+# so yesterday's or superseded profiles are overwritten instead of piling up
+PROFILE_DISK = DiskCache(Path(__file__).parent / "data" / "cache" / "runner_profile")
+
+def profile_slot(data_file: str | Path, lean: bool) -> str:
+    return f"{Path(data_file).resolve()}:{'lean' if lean else 'default'}"
+
+# The slot's profile JSON if it was built by this version, today, from the activity file as it is now
+def current_profile(slot: dict | None, source: list[int] | None, today: str) -> str | None:
+    if slot is None or slot.get("version") != PROFILE_CACHE_VERSION: return None
+    if slot.get("source") != source or slot.get("date") != today: return None
+    return slot["profile"]
@@ -0,0 +1,115 @@
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+# Strava enforces a 15-minute and a daily quota per application, shared by every athlete we sync
+SHORT_WINDOW_SECONDS = 15 * 60
+DAILY_WINDOW_SECONDS = 24 * 60 * 60
+DEFAULT_SHORT_LIMIT = 200
+DEFAULT_DAILY_LIMIT = 2000
+
+def parse_rate_limit_header(value: str | None) -> tuple[int, int] | None:
+    # Headers look like "200,2000" (15-minute, daily)
+    if not value: return None
+    try:
+        short, daily = (int(part) for part in value.split(",")[:2])
+        return (short, daily)
+    except ValueError:
+        return None
+
+def seconds_until_reset(now: float, daily: bool = False) -> float:
+    # Strava windows reset on the quarter hour and at midnight UTC
+    current = datetime.fromtimestamp(now, tz=timezone.utc)
+    if daily:
+        reset = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+    else:
+        reset = current.replace(minute=(current.minute // 15) * 15, second=0, microsecond=0) + timedelta(minutes=15)
+    return (reset - current).total_seconds()
+
+class TokenBucket:
+    def __init__(self, capacity: int, window_seconds: float, clock=time.monotonic):
+        self.capacity = capacity
+        self.window_seconds = window_seconds
+        self.tokens = float(capacity)
+        self.clock = clock
+        self.updated_at = clock()
+
+    @property
+    def rate(self) -> float:
+        return self.capacity / self.window_seconds
+
+    def refill(self) -> None:
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    # Seconds until one token is available (0 if one is available now)
+    def wait_time(self) -> float:
+        self.refill()
+        if self.tokens >= 1: return 0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+    # Sync the bucket with the quota the server reports, never granting more than it allows
+    def resize(self, capacity: int, remaining: float) -> None:
+        self.refill()
+        self.capacity = capacity
+        self.tokens = min(self.tokens, capacity, remaining)
+
+class StravaRateLimiter:
+    def __init__(
+            self,
+            short_limit: int = DEFAULT_SHORT_LIMIT,
+            daily_limit: int = DEFAULT_DAILY_LIMIT,
+            clock=time.monotonic,
+            sleep=time.sleep,
+            wall_clock=time.time
+            ):
+        self.short_bucket = TokenBucket(short_limit, SHORT_WINDOW_SECONDS, clock)
+        self.daily_bucket = TokenBucket(daily_limit, DAILY_WINDOW_SECONDS, clock)
+        self.clock = clock
+        self.sleep = sleep
+        self.wall_clock = wall_clock
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    # Block until both quotas allow one more request
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                wait = max(
+                    self.blocked_until - self.clock(),
+                    self.short_bucket.wait_time(),
+                    self.daily_bucket.wait_time()
+                )
+                if wait <= 0:
+                    self.short_bucket.take()
+                    self.daily_bucket.take()
+                    return
+            self.sleep(wait)
+
+    def update(self, headers) -> None:
+        limits = parse_rate_limit_header(headers.get("X-RateLimit-Limit"))
+        usage = parse_rate_limit_header(headers.get("X-RateLimit-Usage"))
+        if limits is None or usage is None: return
+
+        with self.lock:
+            self.short_bucket.resize(limits[0], limits[0] - usage[0])
+            self.daily_bucket.resize(limits[1], limits[1] - usage[1])
+
+    # Called on a 429: pause every worker until the exhausted window resets
+    def backoff(self, response) -> float:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            delay = float(retry_after)
+        else:
+            limits = parse_rate_limit_header(response.headers.get("X-RateLimit-Limit"))
+            usage = parse_rate_limit_header(response.headers.get("X-RateLimit-Usage"))
+            daily_exhausted = limits is not None and usage is not None and usage[1] >= limits[1]
+            delay = seconds_until_reset(self.wall_clock(), daily=daily_exhausted)
+
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, self.clock() + delay)
+        return delay
@@ -0,0 +1,30 @@
+import json
+import os
+import tempfile
+
+# Write to a temp file in the same directory, then rename over the target.
+# os.replace is atomic, so readers see either the old file or the new one, never a partial write.
+def atomic_write_bytes(path: str, data: bytes) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+def atomic_write_json(path: str, data) -> None:
+    atomic_write_bytes(path, json.dumps(data).encode())
+
+# (size, mtime) of a source file, cheap enough to check on every load to detect a changed file
+def source_signature(source_file: str | None) -> list[int] | None:
+    if source_file is None or not os.path.exists(source_file): return None
+    stat = os.stat(source_file)
+    return [stat.st_size, stat.st_mtime_ns]
@@ -0,0 +1,15 @@
+import sys
+import pytest
+from pathlib import Path
+
+# The backend modules import each other top-level (from models import ...), as when run from backend/
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from benchmarks.synthetic import generate_activities
+from data_processing.activity_store import clean_records
+from data_processing.ingest import runs_frame
+
+# Cleaned runs (clean_records output) from a seeded synthetic history
+@pytest.fixture(scope="session")
+def cleaned_runs():
+    return clean_records(runs_frame(generate_activities(1500)))
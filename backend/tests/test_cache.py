@@ -0,0 +1,62 @@
+from cache import DiskCache, LayeredCache, LRUCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+def test_lru_expiry():
+    clock = FakeClock()
+    cache = LRUCache(clock=clock)
+    cache.set("forecast", "sunny", expires_at=clock.now + 60)
+    cache.set("geocode", "boston")
+    clock.now += 60
+    assert cache.get("forecast") is None
+    assert cache.get("geocode") == "boston"
+    assert len(cache) == 1
+
+def test_disk_expiry_removes_the_file(tmp_path):
+    clock = FakeClock()
+    cache = DiskCache(tmp_path, clock=clock)
+    cache.set("forecast", {"temp": 50}, expires_at=clock.now + 60)
+    assert cache.get("forecast") == {"temp": 50}
+    assert DiskCache(tmp_path, clock=clock).get("forecast") == {"temp": 50}
+
+    clock.now += 60
+    assert cache.get("forecast") is None
+    assert not cache.path("forecast").exists()
+
+def test_disk_prunes_expired_entries_on_write(tmp_path):
+    clock = FakeClock()
+    cache = DiskCache(tmp_path, clock=clock, prune_interval=3600)
+    for lat in range(5):
+        cache.set(f"{lat},0", {"lat": lat}, expires_at=clock.now + 60)
+    cache.set("geocode", [42.3, -71.0])
+
+    # Entries nobody reads again are removed by a later write once the interval has passed
+    clock.now += 3600
+    cache.set("new", {"lat": 9}, expires_at=clock.now + 60)
+    assert sorted(path.name for path in tmp_path.glob("*.json")) == sorted([cache.path("geocode").name, cache.path("new").name])
+
+def test_layered_promotes_disk_hits_with_their_expiry(tmp_path):
+    clock = FakeClock()
+    disk = DiskCache(tmp_path, clock=clock)
+    disk.set("forecast", "rain", expires_at=clock.now + 60)
+    cache = LayeredCache(LRUCache(clock=clock), disk)
+    assert cache.get("forecast") == "rain"
+    assert cache.memory.get("forecast") == "rain"
+
+    clock.now += 60
+    assert cache.get("forecast", "missing") == "missing"
@@ -0,0 +1,19 @@
+import numpy as np
+import pytest
+from data_processing.calculate_race_performances import (RACE_DISTANCES, calculate_ideal_race_time, predict_race_times,
+                                                         solve_ideal_race_time, vdot_table_max_error)
+
+# Half the bisection's final bracket: solve_ideal_race_time is only this close to the exact inverse
+BISECTION_TOLERANCE = 0.005
+
+@pytest.mark.parametrize("race_type", RACE_DISTANCES)
+def test_table_interpolation_error_is_negligible(race_type):
+    assert vdot_table_max_error(race_type) < 1e-5
+
+@pytest.mark.parametrize("race_type", RACE_DISTANCES)
+def test_table_matches_bisection(race_type):
+    vdots = np.arange(25.0, 85.0, 0.7)
+    expected = np.array([solve_ideal_race_time(vdot, race_type) for vdot in vdots])
+    bound = BISECTION_TOLERANCE + vdot_table_max_error(race_type)
+    np.testing.assert_array_less(np.abs(predict_race_times(vdots, race_type) - expected), bound)
+    assert abs(calculate_ideal_race_time(50.0, race_type) - solve_ideal_race_time(50.0, race_type)) < bound
@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+from data_processing.calculate_vdot import calculate_vdot, calculate_vdot_column
+
+def test_column_matches_row_wise(cleaned_runs):
+    row_wise = cleaned_runs.apply(calculate_vdot, axis=1).astype("float64")
+    np.testing.assert_allclose(calculate_vdot_column(cleaned_runs), row_wise, rtol=1e-12)
+
+def test_column_applies_the_same_exclusions():
+    df = pd.DataFrame({
+        "distance": [3.1, 0.5, 5.0, 6.0, 4.0],
+        # a normal run, under 3.5 minutes, 25% rest, no moving time, no elapsed time
+        "moving_time": [21.0, 3.0, 40.0, 0.0, 30.0],
+        "elapsed_time": [21.5, 3.0, 50.0, 10.0, np.nan],
+    })
+    row_wise = df.apply(calculate_vdot, axis=1).astype("float64")
+    np.testing.assert_allclose(calculate_vdot_column(df), row_wise, rtol=1e-12)
+    assert np.isnan(calculate_vdot_column(df)[1:4]).all()
@@ -0,0 +1,10 @@
+import pandas as pd
+from data_processing.categorize_activities import categorize_activities, classify_run, classify_runs, workout_type
+
+def test_classify_runs_matches_classify_run(cleaned_runs):
+    # categorize_activities fills in the percentile columns, then put the Strava tags back
+    df = categorize_activities(cleaned_runs.copy())
+    df["workout_type"] = cleaned_runs["workout_type"].map(workout_type).fillna("None")
+    expected = df.apply(classify_run, axis=1).astype("str")
+    assert expected.nunique() == 6
+    pd.testing.assert_series_equal(classify_runs(df), expected)
@@ -0,0 +1,50 @@
+import json
+import pytest
+import cli
+import pipeline
+import profile_cache
+from benchmarks.synthetic import write_activities
+
+@pytest.fixture
+def data_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_cache.PROFILE_DISK, "directory", tmp_path / "cache")
+    pipeline.PROFILE_MEMORY.clear()
+    return write_activities(tmp_path / "raw_activities.json", 400)
+
+def run_profile(capsys, data_file) -> dict:
+    assert cli.main(["profile", "--data-file", str(data_file)]) == 0
+    return json.loads(capsys.readouterr().out)
+
+def forbid_pipeline(monkeypatch):
+    def timed_import(name):
+        raise AssertionError(f"{name} imported on the fast path")
+    monkeypatch.setattr(cli, "timed_import", timed_import)
+
+def test_profile_is_served_from_the_pipeline_slot(capsys, data_file, monkeypatch):
+    built = run_profile(capsys, data_file)
+    assert built["training_load"] is not None
+    assert len(list(profile_cache.PROFILE_DISK.directory.glob("*.json"))) == 1
+
+    forbid_pipeline(monkeypatch)
+    assert run_profile(capsys, data_file) == built
+
+def test_profile_from_an_older_version_is_rebuilt(capsys, data_file):
+    built = run_profile(capsys, data_file)
+
+    # A slot left by the previous release: same file and day, no training load yet
+    key = profile_cache.profile_slot(data_file, False)
+    slot = profile_cache.PROFILE_DISK.get(key)
+    old_profile = {name: value for name, value in built.items() if not name.startswith("training_load")}
+    profile_cache.PROFILE_DISK.set(key, slot | {"key": "old", "version": profile_cache.PROFILE_CACHE_VERSION - 1,
+                                                "profile": json.dumps(old_profile)})
+    pipeline.PROFILE_MEMORY.clear()
+
+    assert run_profile(capsys, data_file)["training_load"] == built["training_load"]
+    assert profile_cache.PROFILE_DISK.get(key)["version"] == profile_cache.PROFILE_CACHE_VERSION
+
+def test_changed_activity_file_is_rebuilt(capsys, data_file):
+    run_profile(capsys, data_file)
+    write_activities(data_file, 500, seed=1)
+    rebuilt = run_profile(capsys, data_file)
+    pipeline.PROFILE_MEMORY.clear()
+    assert rebuilt == pipeline.build_runner_profile(data_file, use_cache=False).model_dump(mode="json")
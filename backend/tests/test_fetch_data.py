@@ -0,0 +1,104 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import pytest
+import requests
+from benchmarks.synthetic import generate_activities
+from fetch_data import sync_activities, append_activities, start_timestamp, load_sync_state
+from rate_limit import StravaRateLimiter
+
+# Stub of GET /athlete/activities: oldest first, `after` inclusive (so the boundary ids matter),
+# paged by page / per_page, optionally answering the first N requests with 429
+class StubStrava:
+    def __init__(self, activities: list[dict], rate_limited: int = 0):
+        self.activities = activities
+        self.rate_limited = rate_limited
+        self.requests = []
+
+        stub = self
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                params = {key: int(values[0]) for key, values in parse_qs(urlparse(self.path).query).items()}
+                stub.requests.append(params)
+                if stub.rate_limited:
+                    stub.rate_limited -= 1
+                    self.respond(429, [], {"Retry-After": "0"})
+                    return
+                matching = [activity for activity in stub.activities if start_timestamp(activity) >= params["after"]]
+                start = (params["page"] - 1) * params["per_page"]
+                self.respond(200, matching[start:start + params["per_page"]], {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "1,1"})
+
+            def respond(self, status, body, headers):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                for name, value in headers.items(): self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/athlete/activities"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def strava():
+    stubs = []
+    def start(activities, rate_limited=0):
+        stubs.append(StubStrava(activities, rate_limited))
+        return stubs[-1]
+    yield start
+    for stub in stubs: stub.close()
+
+def sync(stub, tmp_path):
+    with requests.Session() as session:
+        return sync_activities(data_file=str(tmp_path / "raw_activities.json"), state_file=str(tmp_path / "sync_state.json"),
+                               session=session, rate_limiter=StravaRateLimiter(sleep=lambda _: None), activities_url=stub.url)
+
+def stored_ids(tmp_path) -> list[int]:
+    with open(tmp_path / "raw_activities.json") as f:
+        return [activity["id"] for activity in json.load(f)]
+
+def test_sync_follows_pages_and_only_appends_new_activities(strava, tmp_path):
+    activities = generate_activities(450)
+    stub = strava(activities[:430])
+    assert len(sync(stub, tmp_path)) == 430
+    assert [request["page"] for request in stub.requests] == [1, 2, 3]
+
+    stub.activities = activities
+    new = sync(stub, tmp_path)
+    assert [activity["id"] for activity in new] == [activity["id"] for activity in activities[430:]]
+    assert stored_ids(tmp_path) == [activity["id"] for activity in activities]
+
+def test_sync_state_only_keeps_the_cursor(strava, tmp_path):
+    activities = generate_activities(50)
+    sync(strava(activities), tmp_path)
+    with open(tmp_path / "sync_state.json") as f:
+        state = json.load(f)
+    assert state["after"] == start_timestamp(activities[-1])
+    assert state["ids"] == [activities[-1]["id"]]
+
+def test_sync_waits_out_429(strava, tmp_path):
+    stub = strava(generate_activities(10), rate_limited=2)
+    assert len(sync(stub, tmp_path)) == 10
+    assert len(stub.requests) == 3
+
+def test_sync_recovers_when_state_was_not_saved_after_append(strava, tmp_path):
+    activities = generate_activities(30)
+    stub = strava(activities[:20])
+    sync(stub, tmp_path)
+
+    # The process died after appending the next batch but before writing the state
+    append_activities(activities[20:], str(tmp_path / "raw_activities.json"))
+    assert load_sync_state(str(tmp_path / "raw_activities.json"), str(tmp_path / "sync_state.json"))["after"] == start_timestamp(activities[-1])
+
+    stub.activities = activities
+    assert sync(stub, tmp_path) == []
+    assert stored_ids(tmp_path) == [activity["id"] for activity in activities]
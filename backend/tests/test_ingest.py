@@ -0,0 +1,28 @@
+import json
+import pandas as pd
+import pytest
+from benchmarks.synthetic import generate_activities
+from data_processing.ingest import iter_json_array, iter_pages, load_runs, runs_frame
+
+@pytest.fixture(scope="module")
+def activities():
+    return generate_activities(300)
+
+def test_streamed_file_matches_json_load(activities, tmp_path):
+    path = tmp_path / "raw_activities.json"
+    path.write_text(json.dumps(activities, indent=2))
+    # A chunk far smaller than one record exercises reads that split records
+    assert list(iter_json_array(path, chunk_size=64)) == json.loads(path.read_text())
+    pd.testing.assert_frame_equal(load_runs(path, chunk_size=64), runs_frame(activities))
+
+def test_pages_stream_into_one_frame(activities):
+    pages = (activities[start:start + 200] for start in range(0, len(activities), 200))
+    df = runs_frame(iter_pages(pages))
+    assert set(df["type"]) == {"Run"}
+    pd.testing.assert_frame_equal(df, runs_frame(activities))
+
+def test_malformed_file(tmp_path):
+    path = tmp_path / "raw_activities.json"
+    path.write_text('[{"id": 1, "type": "Run"}, {"id": 2')
+    with pytest.raises(ValueError, match="Malformed JSON"):
+        list(iter_json_array(path, chunk_size=8))
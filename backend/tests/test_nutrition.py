@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from agent.tools.nutrition.calculator import calculate_nutrition
+from agent.tools.nutrition.helpers import (FIRST_GEL_MINUTES, GEL_CARBS_G, LAST_GEL_BUFFER_MINUTES, MAX_STOP_ML,
+                                           fluid_ml_per_hour)
+
+# Drink stations ~6.5 miles apart: the course that used to ask for ~6 cups at one stop
+SPARSE_STATIONS = [{"mile": 6.5, "water": True}, {"mile": 13.1, "water": True}, {"mile": 20.0, "water": True, "electrolyte": True}]
+
+@pytest.mark.parametrize("temperature_f", [40, 55, 70, 85])
+@pytest.mark.parametrize("aid_stations", [None, SPARSE_STATIONS])
+@pytest.mark.parametrize("duration, distance_miles", [(25.0, 3.1), (100.0, 13.1), (210.0, 26.2), (330.0, 26.2), (240.0, None)])
+def test_no_stop_exceeds_what_the_stomach_empties(duration, distance_miles, temperature_f, aid_stations):
+    response = calculate_nutrition(duration, distance_miles, temperature_f, aid_stations=aid_stations)
+    assert all(entry.fluid_ml <= MAX_STOP_ML for entry in response.hydration_schedule)
+
+def test_sparse_stations_carry_the_rest():
+    response = calculate_nutrition(240.0, 26.2, 75, aid_stations=SPARSE_STATIONS)
+    first = response.hydration_schedule[0]
+    target = first.time_minutes / 60 * fluid_ml_per_hour(75)
+    assert first.fluid_ml == MAX_STOP_ML
+    assert first.fluid_ml + first.carry_ml == pytest.approx(target, abs=1)
+    assert first.note.startswith("Carry fluid")
+    assert response.aid_station_plan[0].actions == ["Drink 2 cups water (~200ml)"]
+    assert "Handheld bottle to drink between stops" in response.carry_recommendations
+
+def test_dense_stations_need_nothing_carried():
+    response = calculate_nutrition(210.0, 26.2, 55)
+    assert all(entry.carry_ml == 0 and entry.note is None for entry in response.hydration_schedule)
+
+def test_short_races_skip_gels():
+    response = calculate_nutrition(25.0, 3.1)
+    assert response.gel_schedule == []
+    assert response.total_carbs_g == 0
+
+def test_marathon_gel_schedule():
+    response = calculate_nutrition(210.0, 26.2, 55)
+    times = np.array([gel.time_minutes for gel in response.gel_schedule])
+    assert times[0] == FIRST_GEL_MINUTES
+    assert times[-1] <= 210.0 - LAST_GEL_BUFFER_MINUTES
+    assert np.all(np.diff(times) > 0)
+    assert response.total_carbs_g == len(times) * GEL_CARBS_G
+    # Gels taken near an aid station are moved there (default stations every 2 miles)
+    assert all(abs(gel.mile - gel.aid_station_mile) <= 1.0 for gel in response.gel_schedule)
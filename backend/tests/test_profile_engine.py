@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+from benchmarks.synthetic import END_DATE
+from data_processing.profile_engine import IncrementalProfile
+
+NUMBER_OF_WEEKS = 12
+
+# Seed from the first 80% of the runs and add the rest one by one
+def build_in_two_steps(df: pd.DataFrame) -> IncrementalProfile:
+    split = len(df) * 4 // 5
+    profile = IncrementalProfile.from_activities(df.iloc[:split])
+    assert profile.add_activities(df.iloc[split:]) == len(df) - split
+    return profile
+
+def assert_same_profile(incremental: IncrementalProfile, full: IncrementalProfile):
+    assert incremental.weeks.keys() == full.weeks.keys()
+    for week_start, week in full.weeks.items():
+        assert incremental.weeks[week_start] == pytest.approx(week, nan_ok=True)
+    assert incremental.avg_weekly_mileage == pytest.approx(full.avg_weekly_mileage)
+    assert incremental.coefficient_of_variance == pytest.approx(full.coefficient_of_variance)
+    pd.testing.assert_frame_equal(incremental.training_load(END_DATE), full.training_load(END_DATE))
+
+    expected = full.to_profile(NUMBER_OF_WEEKS, END_DATE).model_dump()
+    actual = incremental.to_profile(NUMBER_OF_WEEKS, END_DATE).model_dump()
+    assert [week["week_start"] for week in actual["recent_weeks"]] == [week["week_start"] for week in expected["recent_weeks"]]
+    # Sums accumulate in a different order, so the CV (and the consistency penalty) can differ in the last bit
+    assert len(actual["predicted_race_times"]) == len(expected["predicted_race_times"])
+    for prediction, expected_prediction in zip(actual["predicted_race_times"], expected["predicted_race_times"]):
+        assert prediction == pytest.approx(expected_prediction)
+
+def test_incremental_matches_full_build(cleaned_runs):
+    assert_same_profile(build_in_two_steps(cleaned_runs), IncrementalProfile.from_activities(cleaned_runs))
+
+def test_missing_values_match_full_build(cleaned_runs):
+    df = cleaned_runs.copy()
+    # Gaps in the runs that are added incrementally (the last 20%)
+    df.loc[df.index[-10:], "total_elevation_gain"] = np.nan
+    df.loc[df.index[-20:-15], "moving_time"] = np.nan
+    df.loc[df.index[-30:-25], "distance"] = np.nan
+
+    incremental = build_in_two_steps(df)
+    assert not np.isnan(incremental.coefficient_of_variance)
+    assert_same_profile(incremental, IncrementalProfile.from_activities(df))
+
+def test_add_activities_skips_known_ids(cleaned_runs):
+    profile = IncrementalProfile.from_activities(cleaned_runs)
+    mileage = profile.avg_weekly_mileage
+    assert profile.add_activities(cleaned_runs.iloc[-20:]) == 0
+    assert profile.avg_weekly_mileage == mileage
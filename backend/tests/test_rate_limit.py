@@ -0,0 +1,54 @@
+from types import SimpleNamespace
+from rate_limit import StravaRateLimiter, TokenBucket, parse_rate_limit_header, seconds_until_reset
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+def test_parse_rate_limit_header():
+    assert parse_rate_limit_header("200,2000") == (200, 2000)
+    assert parse_rate_limit_header("") is None
+    assert parse_rate_limit_header("abc") is None
+
+def test_seconds_until_reset():
+    # 2026-01-01 00:10:00 UTC
+    now = 1767226200.0
+    assert seconds_until_reset(now) == 5 * 60
+    assert seconds_until_reset(now, daily=True) == 24 * 60 * 60 - 10 * 60
+
+def test_bucket_refills_at_its_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(2, 10, clock)
+    bucket.take()
+    bucket.take()
+    assert bucket.wait_time() == 5
+    clock.now = 5
+    assert bucket.wait_time() == 0
+
+def test_acquire_sleeps_when_the_short_window_is_spent():
+    clock = FakeClock()
+    limiter = StravaRateLimiter(short_limit=2, daily_limit=100, clock=clock, sleep=clock.sleep)
+    for _ in range(3): limiter.acquire()
+    assert clock.now == 15 * 60 / 2
+
+def test_update_never_grants_more_than_the_server_reports():
+    limiter = StravaRateLimiter(clock=FakeClock())
+    limiter.update({"X-RateLimit-Limit": "100,1000", "X-RateLimit-Usage": "99,10"})
+    assert limiter.short_bucket.capacity == 100
+    assert limiter.short_bucket.tokens == 1
+
+def test_backoff_prefers_retry_after():
+    clock = FakeClock()
+    limiter = StravaRateLimiter(clock=clock, sleep=clock.sleep, wall_clock=lambda: 1767226200.0)
+    assert limiter.backoff(SimpleNamespace(headers={"Retry-After": "30"})) == 30
+    # Daily quota used up: wait for midnight UTC
+    exhausted = {"X-RateLimit-Limit": "200,2000", "X-RateLimit-Usage": "10,2000"}
+    assert limiter.backoff(SimpleNamespace(headers=exhausted)) == 24 * 60 * 60 - 10 * 60
+    limiter.acquire()
+    assert clock.now == 24 * 60 * 60 - 10 * 60
@@ -0,0 +1,41 @@
+import pytest
+from pydantic import ValidationError
+from agent.tools.registry import build_registry
+from agent.tools.schema import AGENT_TOOLS
+
+@pytest.fixture
+def registry():
+    return build_registry()
+
+def test_every_schema_is_registered(registry):
+    assert registry.schemas == AGENT_TOOLS
+
+def test_equivalent_arguments_share_one_memo_entry(registry):
+    first = registry.call("calculate_splits", {"pace_strategy": "even", "goal_time_minutes": 240, "distance_miles": 26.2})
+    second = registry.call("calculate_splits", '{"distance_miles": 26.2, "goal_time_minutes": 240.0, "pace_strategy": "even"}')
+    assert second is first
+    assert registry.stats()["calculate_splits"] == {"hits": 1, "misses": 1}
+
+    registry.call("calculate_splits", {"pace_strategy": "negative", "goal_time_minutes": 240, "distance_miles": 26.2})
+    assert registry.stats()["calculate_splits"] == {"hits": 1, "misses": 2}
+
+def test_schema_argument_names_are_mapped(registry):
+    flat = registry.call("calculate_splits", {"pace_strategy": "even", "goal_time_minutes": 30, "distance_miles": 3})
+    hilly = registry.call("calculate_splits", {"pace_strategy": "even", "goal_time_minutes": 30, "distance_miles": 3,
+                                               "elevation_adjustments": [10, 0, -10]})
+    assert hilly.splits[0].pace_minutes > flat.splits[0].pace_minutes
+
+@pytest.mark.parametrize("arguments", [
+    {"pace_strategy": "even", "goal_time_minutes": 240},
+    {"pace_strategy": "sprint", "goal_time_minutes": 240, "distance_miles": 26.2},
+    {"pace_strategy": "even", "goal_time_minutes": 240, "distance_miles": 26.2, "cadence": 180},
+    {"pace_strategy": "even", "goal_time_minutes": 240, "distance_miles": 26.2, "pace_profile": [[0.0, 1.0]]},
+])
+def test_invalid_arguments_are_rejected_before_running(registry, arguments):
+    with pytest.raises(ValidationError):
+        registry.call("calculate_splits", arguments)
+    assert registry.stats()["calculate_splits"] == {"hits": 0, "misses": 0}
+
+def test_unknown_tool(registry):
+    with pytest.raises(ValueError, match="Unknown tool"):
+        registry.call("get_weather", {})
@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from agent.tools.splits import calculate_splits
+from agent.tools.splits.helpers import generate_mile_distances
+from agent.tools.splits.strategies import PACE_STRATEGIES, compile_pace_strategy, linear_ramp
+
+@pytest.mark.parametrize("distance_miles", [3.1, 6.2, 13.1, 26.2])
+@pytest.mark.parametrize("pace_strategy", PACE_STRATEGIES)
+def test_every_strategy_adds_up_to_the_goal_time(pace_strategy, distance_miles):
+    multipliers = compile_pace_strategy(pace_strategy, distance_miles)
+    distances = generate_mile_distances(distance_miles)
+    # Distance-weighted mean multiplier of exactly 1, including the partial final mile
+    assert np.dot(distances, multipliers) / distances.sum() == pytest.approx(1.0)
+
+    response = calculate_splits(pace_strategy, 200.0, distance_miles)
+    assert response.splits[-1].cumulative_time == pytest.approx(200.0)
+
+def test_curves_only_set_the_shape():
+    # A ramp from 2.0 to 2.2 renormalizes to the same splits as 1.0 to 1.1
+    assert np.allclose(compile_pace_strategy(linear_ramp(2.0, 2.2), 13.1), compile_pace_strategy(linear_ramp(1.0, 1.1), 13.1))
+
+def test_custom_profile():
+    response = calculate_splits("even", 240.0, 26.2, pace_profile=[[0.0, 1.05], [1.0, 0.95]])
+    paces = [split.pace_minutes for split in response.splits]
+    assert response.pace_strategy == "custom"
+    assert paces == sorted(paces, reverse=True)
+    assert response.splits[-1].cumulative_time == pytest.approx(240.0)
+
+@pytest.mark.parametrize("pace_profile", [[], [[0.0, 1.0]], [[0.0, 1.0], [1.0]]])
+def test_custom_profile_needs_two_points(pace_profile):
+    with pytest.raises(ValueError, match="at least two"):
+        calculate_splits("even", 240.0, 26.2, pace_profile=pace_profile)
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError, match="Unknown pace strategy"):
+        calculate_splits("sprint", 240.0, 26.2)
+
+def test_curve_must_return_one_multiplier_per_split():
+    with pytest.raises(ValueError, match="multipliers for 27 splits"):
+        calculate_splits(lambda fractions: np.ones(3), 240.0, 26.2)
@@ -0,0 +1,69 @@
+import json
+import threading
+import time
+import pytest
+import requests
+import token_manager
+from token_manager import TokenManager
+
+NOW = 1_000_000.0
+
+class FakeResponse:
+    def __init__(self, body: dict, status_code: int = 200):
+        self.body = body
+        self.status_code = status_code
+        self.headers = {}
+
+    def json(self) -> dict:
+        return self.body
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400: raise requests.HTTPError(f"{self.status_code}")
+
+@pytest.fixture
+def token_file(tmp_path):
+    path = tmp_path / "strava_tokens.json"
+    path.write_text(json.dumps({"access_token": "old", "refresh_token": "refresh", "expires_at": NOW + 60}))
+    return str(path)
+
+@pytest.fixture
+def refreshes(monkeypatch):
+    calls = []
+    def post(url, data):
+        calls.append(data)
+        # Slow enough that every other thread reaches the lock while this one refreshes
+        time.sleep(0.05)
+        return FakeResponse({"access_token": "new", "expires_at": NOW + 6 * 60 * 60})
+    monkeypatch.setattr(token_manager.requests, "post", post)
+    monkeypatch.setattr(token_manager, "load_env", lambda: None)
+    return calls
+
+def test_concurrent_callers_share_one_refresh(token_file, refreshes):
+    manager = TokenManager("id", "secret", clock=lambda: NOW)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get_access_token("1", token_file))) for _ in range(8)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+
+    assert results == ["new"] * 8
+    assert len(refreshes) == 1
+    with open(token_file) as f:
+        assert json.load(f)["access_token"] == "new"
+
+def test_fresh_token_is_served_from_memory(token_file, refreshes):
+    manager = TokenManager("id", "secret", refresh_margin=0, clock=lambda: NOW)
+    assert manager.get_access_token("1", token_file) == "old"
+    # A cached token is not read from the file again
+    with open(token_file, "w") as f: f.write("not json")
+    assert manager.get_access_token("1", token_file) == "old"
+    assert refreshes == []
+
+def test_failed_early_refresh_keeps_the_valid_token(token_file, monkeypatch):
+    monkeypatch.setattr(token_manager.requests, "post", lambda url, data: FakeResponse({}, 500))
+    monkeypatch.setattr(token_manager, "load_env", lambda: None)
+    manager = TokenManager("id", "secret", clock=lambda: NOW)
+    assert manager.get_access_token("1", token_file) == "old"
+
+    expired = TokenManager("id", "secret", clock=lambda: NOW + 120)
+    with pytest.raises(requests.HTTPError):
+        expired.get_access_token("1", token_file)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+import pytest
+from data_processing.calculate_vdot import METERS_PER_MILE, calculate_vo2_cost
+from data_processing.training_load import (DEFAULT_INTENSITY, FATIGUE_DAYS, FITNESS_DAYS, THRESHOLD_VO2_FRACTION, threshold_pace,
+                                           training_load, training_load_summary)
+
+def days(rows: dict) -> pd.DataFrame:
+    index = pd.DatetimeIndex(list(rows), name="date")
+    return pd.DataFrame(list(rows.values()), columns=["hours", "intensity_hours", "vdot_max"], index=index, dtype="float64")
+
+@pytest.mark.parametrize("vdot", [35.0, 50.0, 70.0])
+def test_threshold_pace_costs_88_percent_of_vdot(vdot):
+    velocity = METERS_PER_MILE / threshold_pace(vdot)
+    assert calculate_vo2_cost(velocity) == pytest.approx(THRESHOLD_VO2_FRACTION * vdot)
+
+def test_one_hour_at_threshold_is_100():
+    pace = threshold_pace(50.0)
+    series = training_load(days({"2026-01-05": [1.0, 1.0 / pace ** 2, 50.0]}))
+    assert series.loc["2026-01-05", "load"] == pytest.approx(100.0)
+
+def test_fitness_fatigue_and_form():
+    # Before any VDOT, a run is priced at the default intensity
+    series = training_load(days({"2026-01-05": [1.0, 0.0, np.nan], "2026-01-08": [2.0, 0.0, np.nan]}))
+    load = 100 * DEFAULT_INTENSITY ** 2
+    assert list(series.index.strftime("%m-%d")) == ["01-04", "01-05", "01-06", "01-07", "01-08"]
+    assert series["load"].tolist() == pytest.approx([0, load, 0, 0, 2 * load])
+
+    fitness = [0.0]
+    fatigue = [0.0]
+    for day_load in series["load"].iloc[1:]:
+        fitness.append(fitness[-1] + (day_load - fitness[-1]) / FITNESS_DAYS)
+        fatigue.append(fatigue[-1] + (day_load - fatigue[-1]) / FATIGUE_DAYS)
+    assert series["fitness"].tolist() == pytest.approx(fitness)
+    assert series["fatigue"].tolist() == pytest.approx(fatigue)
+    # Form going into a day is the previous day's fitness - fatigue
+    assert series["form"].tolist() == pytest.approx([0.0] + [f - a for f, a in zip(fitness, fatigue)][:-1])
+    assert series["best_vdot"].isna().all()
+
+def test_series_carries_forward_to_end():
+    series = training_load(days({"2026-01-05": [1.0, 0.0, np.nan]}), end=pd.Timestamp("2026-01-20 18:00"))
+    assert series.index[-1] == pd.Timestamp("2026-01-20")
+    assert series["load"].iloc[-1] == 0
+    assert 0 < series["fitness"].iloc[-1] < series["fitness"].max()
+
+def test_summary_keeps_the_last_day_of_each_week():
+    series = training_load(days({"2026-01-05": [1.0, 0.0, 45.0], "2026-01-14": [1.0, 0.0, np.nan]}), end=pd.Timestamp("2026-01-20"))
+    current, history = training_load_summary(series)
+    assert current.date == pd.Timestamp("2026-01-20")
+    assert [point.date.strftime("%m-%d") for point in history] == ["01-04", "01-11", "01-18", "01-20"]
+    # The rolling best VDOT holds through later runs without one
+    assert current.best_vdot == 45.0
@@ -0,0 +1,86 @@
+import json
+import os
+import threading
+import time
+import requests
+from storage import atomic_write_json
+from instrumentation import observe_response
+from env import load_env
+
+TOKEN_URL = "https://www.strava.com/oauth/token"
+# Refresh a little before expiry so a token never lapses mid-sync
+REFRESH_MARGIN_SECONDS = 300
+
+class TokenManager:
+    def __init__(
+            self,
+            client_id: str | None = None,
+            client_secret: str | None = None,
+            refresh_margin: float = REFRESH_MARGIN_SECONDS,
+            clock=time.time
+            ):
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self.tokens: dict[str, dict] = {}
+        self.locks: dict[str, threading.Lock] = {}
+        self.locks_lock = threading.Lock()
+
+    def athlete_lock(self, athlete_id: str) -> threading.Lock:
+        with self.locks_lock:
+            if athlete_id not in self.locks:
+                self.locks[athlete_id] = threading.Lock()
+            return self.locks[athlete_id]
+
+    def needs_refresh(self, tokens: dict) -> bool:
+        return tokens["expires_at"] - self.refresh_margin <= self.clock()
+
+    def get_access_token(self, athlete_id: str, token_file: str) -> str:
+        # Fast path: cached and fresh, no lock, no file read
+        tokens = self.tokens.get(athlete_id)
+        if tokens is not None and not self.needs_refresh(tokens):
+            return tokens["access_token"]
+
+        # Single flight: the first caller refreshes while the rest wait on the lock,
+        # then find the fresh token already cached
+        with self.athlete_lock(athlete_id):
+            tokens = self.tokens.get(athlete_id)
+            if tokens is None:
+                with open(token_file, mode="r") as f:
+                    tokens = json.load(f)
+
+            if self.needs_refresh(tokens):
+                tokens = self.refresh(tokens, token_file)
+
+            self.tokens[athlete_id] = tokens
+            return tokens["access_token"]
+
+    def refresh(self, tokens: dict, token_file: str) -> dict:
+        print("Refreshing expired token...")
+        load_env()
+        try:
+            response = requests.post(
+                TOKEN_URL,
+                data={
+                    "client_id": self.client_id or os.getenv("STRAVA_CLIENT_ID"),
+                    "client_secret": self.client_secret or os.getenv("STRAVA_CLIENT_SECRET"),
+                    "grant_type": "refresh_token",
+                    "refresh_token": tokens["refresh_token"]
+                }
+            )
+            observe_response("strava.token", response)
+            response.raise_for_status()
+        except requests.RequestException as e:
+            # Refreshing early is best effort, keep using the old token while it is still valid
+            if tokens["expires_at"] > self.clock():
+                print(f"Token refresh failed, using current token: {e}")
+                return tokens
+            raise
+
+        new_tokens = {**tokens, **response.json()}
+        atomic_write_json(token_file, new_tokens)
+        return new_tokens
+
+    def invalidate(self, athlete_id: str) -> None:
+        self.tokens.pop(athlete_id, None)
@@ -1,16 +1,52 @@
 import os
+import time
+import numpy as np
 import requests
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from models import WeatherConditions, WeatherImpact
-from dotenv import load_dotenv
-load_dotenv()    
+from pathlib import Path
+from typing import TYPE_CHECKING
+from cache import LRUCache, DiskCache, LayeredCache
+from instrumentation import observe_response
+from models import WeatherConditions, WeatherImpact, RaceInfo
+from env import load_env
+
+# The splits engine (and its pydantic models) is only loaded by weather_adjusted_splits
+if TYPE_CHECKING:
+    from agent.models import SplitsResponse
 
-OPENWEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY") 
 GEOCODE_URL = "https://api.openweathermap.org/geo/1.0/direct"
 FORECAST_URL = "https://api.openweathermap.org/data/2.5/forecast"
 
-def geocode_location(city: str, state: str = "", country: str = "US") -> tuple[float, float] | None:
-    if not OPENWEATHER_API_KEY:
+CACHE_DIR = Path(__file__).parent / "data" / "cache"
+# OpenWeather publishes a new 5-day forecast every 3 hours
+FORECAST_UPDATE_SECONDS = 3 * 60 * 60
+# ~1km grid, close enough that nearby races share one forecast
+FORECAST_COORD_DECIMALS = 2
+FORECAST_MEMORY_SIZE = 256
+GEOCODE_MEMORY_SIZE = 1024
+MAX_WORKERS = 8
+
+# Geocodes never change, so they are kept on disk forever. Forecasts expire at the next update.
+GEOCODE_CACHE = LayeredCache(LRUCache(GEOCODE_MEMORY_SIZE), DiskCache(CACHE_DIR / "geocode"))
+FORECAST_CACHE = LayeredCache(LRUCache(FORECAST_MEMORY_SIZE), DiskCache(CACHE_DIR / "forecast"))
+
+def forecast_cache_key(lat: float, lon: float) -> str:
+    return f"{lat:.{FORECAST_COORD_DECIMALS}f},{lon:.{FORECAST_COORD_DECIMALS}f}"
+
+# Expire on the next 3-hour boundary (UTC) rather than a sliding TTL so every entry
+# turns over when OpenWeather actually publishes new data
+def forecast_expiry(now: float | None = None) -> float:
+    now = time.time() if now is None else now
+    return (now // FORECAST_UPDATE_SECONDS + 1) * FORECAST_UPDATE_SECONDS
+
+def openweather_api_key() -> str | None:
+    load_env()
+    return os.getenv("OPENWEATHER_API_KEY")
+
+def geocode_location(city: str, state: str = "", country: str = "US", session: requests.Session | None = None) -> tuple[float, float] | None:
+    if not openweather_api_key():
         raise ValueError("OPENWEATHER_API_KEY not set in environment")
 
     # Build location with city, (state optional), country
@@ -19,10 +55,15 @@ def geocode_location(city: str, state: str = "", country: str = "US") -> tuple[f
     query_parts.append(country)
     query = ",".join(query_parts)
 
-    params = {"q": query, "limit": 1, "appid": OPENWEATHER_API_KEY}
+    cached = GEOCODE_CACHE.get(query.lower())
+    if cached is not None:
+        return tuple(cached)
+
+    params = {"q": query, "limit": 1, "appid": openweather_api_key()}
 
     try:                                                                      
-        response = requests.get(GEOCODE_URL, params=params)
+        response = (session or requests).get(GEOCODE_URL, params=params)
+        observe_response("openweather.geocode", response)
         response.raise_for_status()
         data = response.json()
 
@@ -30,60 +71,75 @@ def geocode_location(city: str, state: str = "", country: str = "US") -> tuple[f
             print(f"Location not found: {query}")
             return None
 
-        return (data[0]["lat"], data[0]["lon"])                               
+        coords = (data[0]["lat"], data[0]["lon"])
+        GEOCODE_CACHE.set(query.lower(), list(coords))
+        return coords
 
     except requests.RequestException as e:
         print(f"Geocoding API error: {e}")
         return None
 
-def fetch_weather_forecast(lat: float, lon: float, race_date: datetime) ->  WeatherConditions | None:                                                                  
-    if not OPENWEATHER_API_KEY:
-        raise ValueError("OPENWEATHER_API_KEY not set in environment")
+# Raw 5-day forecast payload for a location, shared by every race near it until the next update
+def get_forecast_data(lat: float, lon: float, session: requests.Session | None = None) -> dict:
+    key = forecast_cache_key(lat, lon)
+    data = FORECAST_CACHE.get(key)
+    if data is not None:
+        return data
+
+    params = {"lat": lat, "lon": lon, "units": "imperial", "appid": openweather_api_key()}
+    response = (session or requests).get(FORECAST_URL, params=params)
+    observe_response("openweather.forecast", response)
+    response.raise_for_status()
+    data = response.json()
+
+    FORECAST_CACHE.set(key, data, expires_at=forecast_expiry())
+    return data
 
+def is_within_forecast_window(race_date: datetime) -> bool:
     # Check if race date is within 5-day forecast window
     days_until_race = (race_date.date() - datetime.now().date()).days
     if days_until_race > 5:
         print(f"Race date {race_date.date()} is beyond 5-day forecast window")
-        return None
+        return False
     if days_until_race < 0:
         print(f"Race date {race_date.date()} is in the past")
-        return None
+        return False
+    return True
+
+# Latest forecast block at or before the race start (blocks are sorted by dt)
+def select_forecast_block(data: dict, race_timestamp: float, timestamps: list[int] | None = None) -> dict:
+    if timestamps is None:
+        timestamps = [forecast["dt"] for forecast in data["list"]]
+    index = bisect_right(timestamps, race_timestamp) - 1
 
-    params = {"lat": lat, "lon": lon, "units": "imperial", "appid": OPENWEATHER_API_KEY}
+    # Fallback: if race is before first forecast, use first available
+    return data["list"][max(index, 0)]
+
+def forecast_to_conditions(forecast: dict) -> WeatherConditions:
+    return WeatherConditions(
+        temperature_f=forecast["main"]["temp"],
+        temperature_c=(forecast["main"]["temp"] - 32) * 5 / 9,
+        feels_like_f=forecast["main"]["feels_like"],
+        feels_like_c=(forecast["main"]["feels_like"] - 32) * 5 / 9,
+        wind_speed_mph=forecast["wind"]["speed"],
+        wind_gust_mph=forecast["wind"].get("gust"),
+        conditions=forecast["weather"][0]["description"],
+        precipitation_mm=forecast.get("rain", {}).get("3h", 0)
+    )
+
+def fetch_weather_forecast(lat: float, lon: float, race_date: datetime) ->  WeatherConditions | None:
+    if not openweather_api_key():
+        raise ValueError("OPENWEATHER_API_KEY not set in environment")
+
+    if not is_within_forecast_window(race_date):
+        return None
 
     try:
         # Get 5 days of 8x 3-hour blocks of weather data
-        response = requests.get(FORECAST_URL, params=params)                  
-        response.raise_for_status()
-        data = response.json()
+        data = get_forecast_data(lat, lon)
 
         # Find the forecast block closest to race start time
-        race_timestamp = race_date.timestamp()
-        best_forecast = None                                                          
-        best_time = 0
-
-        for forecast in data["list"]:
-            forecast_time = forecast["dt"]
-            # Only consider forecasts at or before race time
-            if forecast_time <= race_timestamp and forecast_time > best_time:
-                best_time = forecast_time
-                best_forecast = forecast
-
-        # Fallback: if race is before first forecast, use first available
-        if not best_forecast:
-            best_forecast = data["list"][0]
-
-        # Extract weather conditions                                          
-        return WeatherConditions(
-            temperature_f=best_forecast["main"]["temp"],
-            temperature_c=(best_forecast["main"]["temp"] - 32) * 5 / 9,
-            feels_like_f=best_forecast["main"]["feels_like"],
-            feels_like_c=(best_forecast["main"]["feels_like"] - 32) * 5 / 9,
-            wind_speed_mph=best_forecast["wind"]["speed"],
-            wind_gust_mph=best_forecast["wind"].get("gust"),
-            conditions=best_forecast["weather"][0]["description"],
-            precipitation_mm=best_forecast.get("rain", {}).get("3h", 0)
-        )
+        return forecast_to_conditions(select_forecast_block(data, race_date.timestamp()))
 
     except requests.RequestException as e:
         print(f"Weather API error: {e}")
@@ -121,6 +177,67 @@ def assess_weather_impacts(weather: WeatherConditions) -> WeatherImpact:
         risk_factors=risk_factors
     )
 
+# Forecast series interpolated to arbitrary points in the race (minutes after the start)
+def interpolate_race_weather(data: dict, race_date: datetime, elapsed_minutes) -> dict[str, np.ndarray]:
+    forecasts = data["list"]
+    timestamps = np.array([forecast["dt"] for forecast in forecasts], dtype="float64")
+    times = race_date.timestamp() + np.asarray(elapsed_minutes, dtype="float64") * 60
+
+    # np.interp holds the first/last block outside the forecast range
+    series = {
+        "temperature_f": [forecast["main"]["temp"] for forecast in forecasts],
+        "feels_like_f": [forecast["main"]["feels_like"] for forecast in forecasts],
+        "wind_speed_mph": [forecast["wind"]["speed"] for forecast in forecasts],
+    }
+    return {name: np.interp(times, timestamps, values) for name, values in series.items()}
+
+# Vectorized assess_weather_impacts: same thresholds, one slowdown fraction per element
+def assess_weather_impacts_per_mile(feels_like_f, wind_speed_mph) -> np.ndarray:
+    temp = np.asarray(feels_like_f, dtype="float64")
+    wind_speed = np.asarray(wind_speed_mph, dtype="float64")
+
+    temperature_impact = np.select([temp > 60, temp < 30], [0.01 * (temp - 60) / 5, 0.01 * (30 - temp) / 3], 0.0)
+    wind_impact = np.select([wind_speed >= 20, wind_speed >= 15, wind_speed >= 10], [0.05, 0.025, 0.01], 0.0)
+    return temperature_impact + wind_impact
+
+# Seconds per mile to add to each split for the weather expected while running that mile
+def weather_pace_adjustments(data: dict, race_date: datetime, splits: "SplitsResponse") -> np.ndarray:
+    cumulative_times = np.array([split.cumulative_time for split in splits.splits])
+    paces = np.array([split.pace_minutes for split in splits.splits])
+
+    # Sample the weather halfway through each mile
+    start_times = np.concatenate([[0.0], cumulative_times[:-1]])
+    weather = interpolate_race_weather(data, race_date, (start_times + cumulative_times) / 2)
+    impacts = assess_weather_impacts_per_mile(weather["feels_like_f"], weather["wind_speed_mph"])
+    return paces * impacts * 60
+
+def weather_adjusted_splits(
+        lat: float,
+        lon: float,
+        race_date: datetime,
+        pace_strategy: str,
+        goal_time_minutes: float,
+        distance_miles: float,
+        elevation_adjustment: list[float] | None = None
+        ) -> "SplitsResponse | None":
+    from agent.tools.splits import calculate_splits
+    from agent.tools.splits.helpers import elevation_adjustment_array
+
+    if not is_within_forecast_window(race_date):
+        return None
+
+    try:
+        data = get_forecast_data(lat, lon)
+    except requests.RequestException as e:
+        print(f"Weather API error: {e}")
+        return None
+
+    # Project the race timeline from the planned splits, then fold weather into the same adjustment path
+    splits = calculate_splits(pace_strategy, goal_time_minutes, distance_miles, elevation_adjustment)
+    adjustments = weather_pace_adjustments(data, race_date, splits) + elevation_adjustment_array(len(splits.splits), elevation_adjustment)
+
+    return calculate_splits(pace_strategy, goal_time_minutes, distance_miles, adjustments.tolist())
+
 def get_race_weather(city: str, state: str, race_date: datetime, country: str = "US") -> tuple[WeatherConditions, WeatherImpact] | None:
       coords = geocode_location(city, state, country)
       if not coords:
@@ -130,4 +247,69 @@ def get_race_weather(city: str, state: str, race_date: datetime, country: str =
       weather = fetch_weather_forecast(lat, lon, race_date)
       if (weather == None): return None
       weather_impact = assess_weather_impacts(weather)
-      return (weather, weather_impact)
\ No newline at end of file
+      return (weather, weather_impact)
+
+# "Boston, MA" / "Boston, MA, US" -> (city, state, country)
+def parse_location(location: str) -> tuple[str, str, str]:
+    parts = [part.strip() for part in location.split(",")]
+    city = parts[0]
+    state = parts[1] if len(parts) > 1 else ""
+    country = parts[2] if len(parts) > 2 else "US"
+    return (city, state, country)
+
+def create_weather_session(max_workers: int = MAX_WORKERS) -> requests.Session:
+    # Size the connection pool to the worker count so no thread waits for a connection
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=max_workers)
+    session.mount("https://", adapter)
+    return session
+
+def get_races_weather(races: list[RaceInfo], max_workers: int = MAX_WORKERS) -> list[tuple[RaceInfo, WeatherImpact | None]]:
+    if not openweather_api_key():
+        raise ValueError("OPENWEATHER_API_KEY not set in environment")
+
+    with create_weather_session(max_workers) as session, ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Geocode each distinct location once
+        locations = {race.location for race in races if race.lat is None or race.lon is None}
+        geocoded = dict(zip(locations, executor.map(lambda location: geocode_location(*parse_location(location), session=session), locations)))
+
+        race_coords = [
+            (race.lat, race.lon) if race.lat is not None and race.lon is not None else geocoded[race.location]
+            for race in races
+        ]
+
+        # Only races inside the forecast window need a forecast, download each distinct one once
+        race_keys = [
+            forecast_cache_key(*coords) if coords is not None and is_within_forecast_window(race.date) else None
+            for race, coords in zip(races, race_coords)
+        ]
+        forecast_coords = {key: coords for key, coords in zip(race_keys, race_coords) if key is not None}
+
+        def fetch(coords):
+            try:
+                return get_forecast_data(*coords, session=session)
+            except requests.RequestException as e:
+                print(f"Weather API error: {e}")
+                return None
+
+        forecasts = dict(zip(forecast_coords, executor.map(fetch, forecast_coords.values())))
+
+    # Sorted block timestamps per forecast, shared by every race at that location
+    timestamps = {
+        key: [forecast["dt"] for forecast in data["list"]]
+        for key, data in forecasts.items() if data is not None
+    }
+
+    results = []
+    for race, coords, key in zip(races, race_coords, race_keys):
+        if coords is not None:
+            race = race.model_copy(update={"lat": coords[0], "lon": coords[1]})
+        if key not in timestamps:
+            results.append((race, None))
+            continue
+
+        block = select_forecast_block(forecasts[key], race.date.timestamp(), timestamps[key])
+        weather = forecast_to_conditions(block)
+        results.append((race.model_copy(update={"weather": weather}), assess_weather_impacts(weather)))
+
+    return results